@@ -0,0 +1,159 @@
+"""Scanner-vs-human agreement metrics for every (scanner, validation) column pair of a summary table."""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import binom
+
+DEFAULT_THRESHOLDS = (1, 2, 3)
+
+
+def agreement_table(
+    summary: pd.DataFrame,
+    scanner_columns: list[str],
+    validation_columns: list[str],
+    thresholds: tuple[float, ...] = DEFAULT_THRESHOLDS,
+    validation_positive_at: float | None = 1,
+    n_boot: int = 10_000,
+    alpha: float = 0.05,
+    seed: int = 0,
+    boot_block: int = 1_000,
+) -> pd.DataFrame:
+    """Compare every scanner column against every validation column at every threshold.
+
+    Scores on the 0-3 scale are binarized as ``value >= threshold`` (so a
+    boolean ``grading_*`` column is positive at threshold 1).  Confusion
+    matrices for all pairs and thresholds come from one one-hot encoding per
+    validation column, and the bootstrap resamples each validation column's
+    labelled transcripts once for all scanners and thresholds: resample
+    counts are drawn as a ``(n_boot, n_labelled)`` weight matrix and
+    multiplied by the one-hot confusion cell of every (scanner, threshold),
+    in blocks of *boot_block* resamples to bound memory.
+
+    Parameters
+    ----------
+    summary:
+        DataFrame from :func:`scan_utils.build_summary` (one row per
+        transcript with scanner and validation columns).
+    scanner_columns:
+        Scanner value columns to evaluate.
+    validation_columns:
+        Human label columns to evaluate against.
+    thresholds:
+        Scanner thresholds.  Thresholds above a scanner's largest observed
+        value are skipped.
+    validation_positive_at:
+        Lowest human label counted as positive.  When *None*, the human
+        labels are binarized at the same threshold as the scanner.
+    n_boot:
+        Bootstrap resamples (0 to skip the confidence intervals).
+    alpha:
+        Two-sided level of the percentile bootstrap intervals.
+    seed:
+        Seed for the bootstrap resampling.
+    boot_block:
+        Resamples processed per block.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per (``scanner``, ``validation``, ``threshold``) with the
+        transcripts labelled by both (``n``), confusion counts ``tp``,
+        ``fp``, ``fn``, ``tn``, ``accuracy``, ``sensitivity``,
+        ``specificity`` and ``kappa`` (each of the last three with
+        ``_low``/``_high`` bootstrap bounds), and the exact McNemar
+        ``mcnemar_p`` for scanner/human disagreement.
+    """
+    rng = np.random.default_rng(seed)
+    scores = summary[scanner_columns].to_numpy(dtype=float, na_value=np.nan)
+    max_score = np.where(np.isnan(scores), -np.inf, scores).max(axis=0, initial=-np.inf)
+
+    frames = []
+    for validation in validation_columns:
+        labels_all = pd.to_numeric(summary[validation], errors="coerce").to_numpy(dtype=float)
+        labelled = ~np.isnan(labels_all)
+        labels = labels_all[labelled]
+        pairs = [
+            (s, t) for s in range(len(scanner_columns)) for t in thresholds if t <= max_score[s]
+        ]
+        if not labelled.any() or not pairs:
+            continue
+        s_idx = np.array([s for s, _ in pairs])
+        t_val = np.array([t for _, t in pairs], dtype=float)
+
+        # Confusion cell per (transcript, pair): 0=tp 1=fp 2=fn 3=tn, -1 where the scanner has no value
+        pair_scores = scores[labelled][:, s_idx]
+        predicted = pair_scores >= t_val
+        actual = labels[:, None] >= (t_val if validation_positive_at is None else validation_positive_at)
+        cells = np.where(np.isnan(pair_scores), -1, _cell(predicted, actual))
+        onehot = np.zeros((len(labels), len(pairs) * 4))
+        rows, cols = np.nonzero(cells >= 0)
+        onehot[rows, cols * 4 + cells[rows, cols]] = 1.0
+
+        counts = onehot.sum(axis=0).reshape(len(pairs), 4)
+        frame = pd.DataFrame({
+            "scanner": [scanner_columns[s] for s, _ in pairs],
+            "validation": validation,
+            "threshold": t_val,
+            "n": counts.sum(axis=1).astype(int),
+            "tp": counts[:, 0].astype(int),
+            "fp": counts[:, 1].astype(int),
+            "fn": counts[:, 2].astype(int),
+            "tn": counts[:, 3].astype(int),
+        })
+        point = _metrics(counts)
+        frame["accuracy"] = (counts[:, 0] + counts[:, 3]) / counts.sum(axis=1)
+        for name, values in point.items():
+            frame[name] = values
+            frame[f"{name}_low"] = np.nan
+            frame[f"{name}_high"] = np.nan
+        frame["mcnemar_p"] = _exact_mcnemar(counts[:, 1], counts[:, 2])
+
+        if n_boot:
+            draws = {name: [] for name in point}
+            n = len(labels)
+            for start in range(0, n_boot, boot_block):
+                block = min(boot_block, n_boot - start)
+                picks = rng.integers(0, n, size=(block, n)) + n * np.arange(block)[:, None]
+                weights = np.bincount(picks.ravel(), minlength=block * n).reshape(block, n).astype(float)
+                boot_counts = (weights @ onehot).reshape(block, len(pairs), 4)
+                for name, values in _metrics(boot_counts).items():
+                    draws[name].append(values)
+            for name, blocks in draws.items():
+                low, high = np.nanquantile(np.concatenate(blocks), [alpha / 2, 1 - alpha / 2], axis=0)
+                frame[f"{name}_low"], frame[f"{name}_high"] = low, high
+        frames.append(frame)
+
+    if not frames:
+        raise ValueError("No (scanner, validation) pair has transcripts labelled by both")
+    return pd.concat(frames, ignore_index=True)
+
+
+# ---------------------------------------------------------------------------
+# Internal helpers
+# ---------------------------------------------------------------------------
+
+
+def _cell(predicted: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """Confusion cell index: 0=tp, 1=fp, 2=fn, 3=tn."""
+    return np.where(predicted, np.where(actual, 0, 1), np.where(actual, 2, 3))
+
+
+def _metrics(counts: np.ndarray) -> dict[str, np.ndarray]:
+    """Sensitivity, specificity and Cohen's kappa from ``[..., (tp, fp, fn, tn)]`` counts."""
+    tp, fp, fn, tn = np.moveaxis(counts, -1, 0)
+    n = tp + fp + fn + tn
+    with np.errstate(divide="ignore", invalid="ignore"):
+        observed = (tp + tn) / n
+        expected = ((tp + fp) * (tp + fn) + (fn + tn) * (fp + tn)) / n**2
+        return {
+            "sensitivity": tp / (tp + fn),
+            "specificity": tn / (tn + fp),
+            "kappa": (observed - expected) / (1 - expected),
+        }
+
+
+def _exact_mcnemar(b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Two-sided exact (binomial) McNemar p-value for discordant counts *b* and *c*."""
+    discordant = b + c
+    p = 2 * binom.cdf(np.minimum(b, c), discordant, 0.5)
+    return np.where(discordant > 0, np.minimum(p, 1.0), 1.0)
@@ -1,11 +1,32 @@
 """Utilities for loading eval logs, scan results, and validation data into DataFrames."""
 
+import codecs
+import csv
+import hashlib
 import json
+import os
+import shutil
+import sqlite3
+import warnings
 import zipfile
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import IO, Literal
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Sidecar file written inside an eval-logs directory by load_eval_logs(cache=True)
+EVAL_CACHE_NAME = ".summaries_cache.sqlite"
+
+# Directory written inside a scan-results directory by load_scan_results(index=True)
+SCAN_INDEX_NAME = ".scan_index"
 
 
 def load_eval_logs(
@@ -14,6 +35,9 @@ def load_eval_logs(
     score_key: str | None = None,
     success_fn: Callable | None = None,
     exclude_patterns: list[str] | None = None,
+    workers: int | None = None,
+    cache: bool = False,
+    stream: bool = False,
 ) -> pd.DataFrame:
     """Load transcript metadata from ``.eval`` log files.
 
@@ -42,10 +66,26 @@ def load_eval_logs(
         the raw value is used directly.
     success_fn:
         Custom function ``(score_value) -> bool`` to determine success.
-        When *None*, :func:`_is_success` is used.
+        When *None*, :func:`_is_success` semantics are applied in a single
+        vectorized pass.
     exclude_patterns:
         List of substrings; ``.eval`` files whose path contains any of
         these strings are skipped (e.g. ``["%2B", "broken"]``).
+    workers:
+        Number of worker processes used to parse archives.  When *None* or
+        ``1``, archives are read sequentially in the calling process.  Rows
+        are returned in the same order either way.
+    cache:
+        Keep extracted summaries in a sqlite sidecar
+        (:data:`EVAL_CACHE_NAME`) inside *eval_logs_dir*, keyed by archive
+        path, size and mtime, so only new or modified archives are
+        re-opened.  Off by default, since it writes into the data directory;
+        use :func:`clear_eval_log_cache` to invalidate it.
+    stream:
+        Decode ``summaries.json`` one sample at a time from the zip member
+        instead of reading and parsing the whole array at once.  Only the
+        extracted fields are kept, which bounds peak memory to roughly one
+        sample per archive.  Output is identical.
 
     Returns
     -------
@@ -64,43 +104,88 @@ def load_eval_logs(
     if not eval_files:
         raise FileNotFoundError(f"No .eval files found under {eval_logs_dir}")
 
-    check_success = success_fn or _is_success
-
-    rows: list[dict] = []
-    for eval_file in eval_files:
-        label = _label_from_path(eval_file, label_segment) if label_segment else None
-        with zipfile.ZipFile(eval_file) as zf:
-            summaries = json.loads(zf.read("summaries.json"))
-            for s in summaries:
-                scores = s.get("scores", {})
-                # Take the first scorer's value
-                score_val = None
-                if scores:
-                    first_score = next(iter(scores.values()))
-                    score_val = first_score.get("value")
-                if score_key is not None and isinstance(score_val, dict):
-                    score_val = score_val.get(score_key)
-                row = {
-                    "transcript_id": s["uuid"],
-                    "task_id": s["id"],
-                    "transcript_score": score_val,
-                    "transcript_success": check_success(score_val),
-                    "eval_file": str(eval_file.relative_to(eval_logs_dir)),
-                }
-                if label is not None:
-                    row["eval_label"] = label
-                rows.append(row)
-
-    return pd.DataFrame(rows)
-
-
-def load_scan_results(scan_results_dir: str | Path) -> pd.DataFrame:
+    if cache:
+        per_file = _cached_summaries(eval_logs_dir, eval_files, workers, stream)
+    else:
+        per_file = _read_eval_files(eval_files, workers, stream)
+
+    # Build columns directly rather than one dict per transcript
+    transcript_ids: list = []
+    task_ids: list = []
+    scores: list = []
+    eval_file_col: list[str] = []
+    label_col: list[str] = []
+    for eval_file, summaries in zip(eval_files, per_file):
+        n = len(summaries)
+        if not n:
+            continue
+        ids, tasks, values = zip(*summaries)
+        transcript_ids.extend(ids)
+        task_ids.extend(tasks)
+        if score_key is not None:
+            values = [v.get(score_key) if isinstance(v, dict) else v for v in values]
+        scores.extend(values)
+        eval_file_col.extend([str(eval_file.relative_to(eval_logs_dir))] * n)
+        if label_segment:
+            label_col.extend([_label_from_path(eval_file, label_segment)] * n)
+
+    if success_fn is not None:
+        success = [success_fn(v) for v in scores]
+    else:
+        success = _is_success_vectorized(scores)
+
+    columns = {
+        "transcript_id": transcript_ids,
+        "task_id": task_ids,
+        "transcript_score": scores,
+        "transcript_success": success,
+        "eval_file": eval_file_col,
+    }
+    if label_segment:
+        columns["eval_label"] = label_col
+    return pd.DataFrame(columns)
+
+
+def clear_eval_log_cache(eval_logs_dir: str | Path) -> bool:
+    """Delete the summary cache written by :func:`load_eval_logs`.
+
+    Parameters
+    ----------
+    eval_logs_dir:
+        The same directory that was passed to :func:`load_eval_logs`.
+
+    Returns
+    -------
+    bool
+        ``True`` if a cache file was removed.
+    """
+    cache_path = Path(eval_logs_dir) / EVAL_CACHE_NAME
+    if not cache_path.exists():
+        return False
+    cache_path.unlink()
+    return True
+
+
+def load_scan_results(
+    scan_results_dir: str | Path,
+    columns: list[str] | None = None,
+    scanner_keys: list[str] | None = None,
+    scan_ids: list[str] | None = None,
+    transcript_ids: list[str] | None = None,
+    output: Literal["pandas", "arrow", "lazy"] = "pandas",
+    index: bool = False,
+) -> pd.DataFrame | pa.Table | ds.Scanner:
     """Load scanner output parquet files from scan-result directories.
 
     Recursively finds every ``scan_id=*`` subdirectory under
-    *scan_results_dir* and concatenates the parquet files found within.
-    Can be pointed at either a top-level scan-results directory or a
-    specific subdirectory.
+    *scan_results_dir* and reads the parquet files found within as a single
+    :mod:`pyarrow.dataset`.  Can be pointed at either a top-level
+    scan-results directory or a specific subdirectory.
+
+    Column projection and the filters below are pushed down into the
+    parquet reader, so e.g. ``columns=["transcript_id", "scanner_key",
+    "value"]`` never decodes the large ``explanation`` strings written by
+    the ``grading_*`` scanners.
 
     Parameters
     ----------
@@ -108,39 +193,196 @@ def load_scan_results(scan_results_dir: str | Path) -> pd.DataFrame:
         Path to a scan-results directory (e.g.
         ``eval_grading/swe_bench/scan-results`` or
         ``eval_grading/swe_bench/scan-results/synth``).
+    columns:
+        Parquet columns to read.  When *None*, all columns are read.
+    scanner_keys:
+        Only keep rows whose ``scanner_key`` is in this list.
+    scan_ids:
+        Only read ``scan_id=<id>`` directories whose id is in this list.
+        Filtering happens on directory names, so other scans are never
+        opened.
+    transcript_ids:
+        Only keep rows whose ``transcript_id`` is in this list.
+    output:
+        ``"pandas"`` (default) returns a DataFrame, ``"arrow"`` returns a
+        :class:`pyarrow.Table`, and ``"lazy"`` returns an unevaluated
+        :class:`pyarrow.dataset.Scanner` (call ``.to_table()`` or
+        ``.to_batches()`` on it).  Lazy output is not deduplicated across
+        resumed fragments (see Returns).
+    index:
+        Read through a persistent index in ``<scan_results_dir>/.scan_index``
+        (see :data:`SCAN_INDEX_NAME`).  Each ``scan_id=*`` directory is
+        compacted once into a single parquet part and recorded, together
+        with its ``_scan.json``, in ``manifest.json``.  Later loads only
+        ingest new or modified scan directories.  Use
+        :func:`clear_scan_index` to rebuild from scratch.
 
     Returns
     -------
-    pd.DataFrame
-        One row per (transcript, scanner) result from the parquet files,
-        with an added ``value_num`` column (``value`` cast to float).
+    pd.DataFrame | pa.Table | ds.Scanner
+        One row per (transcript, scanner) result from the parquet files.
+        The pandas output has an added ``value_num`` column (``value`` cast
+        to float) whenever ``value`` was read.  ``value`` has one type
+        across all scans: when scanners wrote incompatible types it is read
+        as strings (``"true"``, ``"2"``), not the original Python objects
+        (see :func:`_unified_schema`).  Scans checkpointed by
+        ``tools/batch_scan.py`` carry a ``fragment`` column; when a pair was
+        written to more than one fragment (a resumed run re-did it), only
+        the rows from its newest fragment are kept.
     """
     scan_results_dir = Path(scan_results_dir)
-    scan_dirs = sorted(scan_results_dir.rglob("scan_id=*"))
-    if not scan_dirs:
+    all_scan_dirs = sorted(d for d in scan_results_dir.rglob("scan_id=*") if d.is_dir())
+    if not all_scan_dirs:
         raise FileNotFoundError(
             f"No scan_id=* directories found under {scan_results_dir}"
         )
+    scan_dirs = all_scan_dirs
+    if scan_ids is not None:
+        wanted_ids = set(scan_ids)
+        scan_dirs = [d for d in scan_dirs if d.name.split("=", 1)[1] in wanted_ids]
 
-    frames: list[pd.DataFrame] = []
-    for scan_dir in scan_dirs:
-        for pq_path in sorted(scan_dir.glob("*.parquet")):
-            frames.append(pd.read_parquet(pq_path))
+    if index:
+        pq_paths = _indexed_scan_parts(scan_results_dir, all_scan_dirs, scan_dirs)
+    else:
+        pq_paths = [
+            str(pq_path)
+            for scan_dir in scan_dirs
+            for pq_path in sorted(scan_dir.glob("*.parquet"))
+        ]
+    if not pq_paths:
+        raise FileNotFoundError(f"No parquet files found for the requested scans under {scan_results_dir}")
+
+    dataset = ds.dataset(pq_paths, schema=_unified_schema(pq_paths), format="parquet")
+
+    predicate = None
+    for field, allowed in (("scanner_key", scanner_keys), ("transcript_id", transcript_ids)):
+        if allowed is None:
+            continue
+        expr = ds.field(field).isin(list(allowed))
+        predicate = expr if predicate is None else predicate & expr
+
+    fragmented = "fragment" in dataset.schema.names
+    read_columns = columns
+    if fragmented and columns is not None and output != "lazy":
+        read_columns = list(dict.fromkeys([*columns, *_FRAGMENT_KEY, "fragment"]))
 
-    combined = pd.concat(frames, ignore_index=True)
-    combined["value_num"] = pd.to_numeric(combined["value"], errors="coerce")
+    scanner = dataset.scanner(columns=read_columns, filter=predicate)
+    if output == "lazy":
+        return scanner
+    table = scanner.to_table()
+    if fragmented:
+        table = _drop_superseded_fragments(table)
+        if columns is not None:
+            table = table.select(columns)
+    if output == "arrow":
+        return table
+
+    combined = table.to_pandas()
+    if "value" in combined.columns:
+        combined["value_num"] = _value_num(combined["value"])
     return combined
 
 
+def clear_scan_index(scan_results_dir: str | Path) -> bool:
+    """Delete the index written by :func:`load_scan_results` (``index=True``).
+
+    Parameters
+    ----------
+    scan_results_dir:
+        The same directory that was passed to :func:`load_scan_results`.
+
+    Returns
+    -------
+    bool
+        ``True`` if an index directory was removed.
+    """
+    index_dir = Path(scan_results_dir) / SCAN_INDEX_NAME
+    if not index_dir.exists():
+        return False
+    shutil.rmtree(index_dir)
+    return True
+
+
+def missing_scan_pairs(
+    eval_logs_dir: str | Path,
+    scan_results_dir: str | Path,
+    scanner_keys: list[str],
+    exclude_patterns: list[str] | None = None,
+    index: bool = False,
+    cache: bool = False,
+) -> pd.DataFrame:
+    """List the (transcript, scanner) pairs in an eval-logs tree that have no scan results yet.
+
+    Diffs the transcript IDs from :func:`load_eval_logs` against the
+    ``(transcript_id, scanner_key)`` pairs already present in any scan under
+    *scan_results_dir*.  Pairs whose only results carry a ``scan_error``
+    count as missing, so they are run again.  Only those columns are read
+    from the scan results, and both sides can come from their caches (the eval-log summary
+    cache with *cache*, the scan index with *index*), so checking a large tree for a
+    handful of new runs stays cheap.
+
+    Parameters
+    ----------
+    eval_logs_dir:
+        Directory containing ``.eval`` files (searched recursively).
+    scan_results_dir:
+        Directory containing ``scan_id=*`` subdirectories.  A directory with
+        no scans yet means every pair is missing.
+    scanner_keys:
+        Scanners to check for.
+    exclude_patterns:
+        Passed to :func:`load_eval_logs`.
+    index:
+        Passed to :func:`load_scan_results`; off by default there too, so
+        no ``.scan_index`` is written unless asked for.
+    cache:
+        Passed to :func:`load_eval_logs`.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per missing pair with columns ``transcript_id``,
+        ``eval_file`` (relative to *eval_logs_dir*) and ``scanner_key``.
+    """
+    logs = load_eval_logs(eval_logs_dir, label_segment=None, exclude_patterns=exclude_patterns, cache=cache)
+    pairs = logs[["transcript_id", "eval_file"]].merge(
+        pd.DataFrame({"scanner_key": list(scanner_keys)}), how="cross"
+    )
+    try:
+        schema = load_scan_results(
+            scan_results_dir, scanner_keys=list(scanner_keys), index=index, output="lazy"
+        ).projected_schema
+    except FileNotFoundError:
+        return pairs
+    columns = ["transcript_id", "scanner_key"]
+    if "scan_error" in schema.names:
+        columns.append("scan_error")
+    done = load_scan_results(
+        scan_results_dir,
+        columns=columns,
+        scanner_keys=list(scanner_keys),
+        index=index,
+    )
+    if "scan_error" in done.columns:
+        done = done[done["scan_error"].isna()]
+    done = done[["transcript_id", "scanner_key"]].drop_duplicates()
+    merged = pairs.merge(done, on=["transcript_id", "scanner_key"], how="left", indicator=True)
+    return merged.loc[merged["_merge"] == "left_only", pairs.columns].reset_index(drop=True)
+
+
 def load_validations(
     validation_dir: str | Path,
     prefix: str = "swe_bench_",
+    include_predicate: bool = False,
 ) -> pd.DataFrame:
     """Load validation CSVs and return a single DataFrame keyed by transcript ID.
 
     Each CSV is expected to have columns ``id`` and ``target``.  CSVs that
     lack these columns are silently skipped.  The filename (minus ``.csv``)
-    is used to derive the column name by stripping *prefix*.
+    is used to derive the column name by stripping *prefix*.  Only the
+    needed columns are converted (see :func:`_read_csv_columns`), and the
+    wide table is built with a single index-aligned concat rather than one
+    merge per CSV.
 
     Parameters
     ----------
@@ -148,37 +390,51 @@ def load_validations(
         Directory (searched recursively) containing validation CSV files.
     prefix:
         Leading portion of each filename to strip when building column names.
+    include_predicate:
+        Also read each CSV's ``predicate`` column (when present) into a
+        ``<name>_predicate`` column.
 
     Returns
     -------
     pd.DataFrame
-        Indexed by ``transcript_id`` with one column per validation CSV.
+        One row per ``transcript_id`` with one column per validation CSV.
     """
     validation_dir = Path(validation_dir)
     csv_paths = sorted(validation_dir.rglob("*.csv"))
     if not csv_paths:
         raise FileNotFoundError(f"No CSV files found under {validation_dir}")
 
-    result: pd.DataFrame | None = None
+    wanted = {"id", "target", "predicate"} if include_predicate else {"id", "target"}
+    columns: list[pd.Series] = []
     for csv_path in csv_paths:
-        df = pd.read_csv(csv_path)
-        if "id" not in df.columns or "target" not in df.columns:
+        df = _read_csv_columns(csv_path, wanted)
+        if df is None or "target" not in df.columns:
             continue
         col_name = csv_path.stem
         if col_name.startswith(prefix):
             col_name = col_name[len(prefix) :]
-        val = df[["id", "target"]].rename(
-            columns={"id": "transcript_id", "target": col_name}
-        )
-        if result is None:
-            result = val
-        else:
-            result = result.merge(val, on="transcript_id", how="outer")
-    if result is None:
+        df = df.set_index("id")
+        columns.append(df["target"].rename(col_name))
+        if include_predicate and "predicate" in df.columns:
+            columns.append(df["predicate"].rename(f"{col_name}_predicate"))
+    if not columns:
         raise FileNotFoundError(
             f"No CSV files with 'id' and 'target' columns found under {validation_dir}"
         )
-    return result
+
+    if len(columns) == 1:
+        result = columns[0].to_frame()
+    elif any(c.index.has_duplicates for c in columns):
+        # Index alignment needs unique ids; keep the many-to-many merge semantics
+        result = columns[0].to_frame()
+        for col in columns[1:]:
+            result = result.merge(col, left_index=True, right_index=True, how="outer")
+    else:
+        # Outer-align every column on transcript id in one pass, sorted like an
+        # outer merge; copy() consolidates the one-block-per-CSV result
+        result = pd.concat(columns, axis=1, join="outer", sort=True).copy()
+    result.index.name = "transcript_id"
+    return result.reset_index()
 
 
 def build_summary(
@@ -211,32 +467,625 @@ def build_summary(
     summary = logs.copy()
 
     if scans is not None:
-        # Deduplicate: first value per (transcript, scanner)
-        agg = (
-            scans.groupby(["transcript_id", "scanner_key"])
-            .agg(value=("value_num", "first"))
-            .reset_index()
-        )
-        pivot = agg.pivot_table(
-            index="transcript_id",
-            columns="scanner_key",
-            values="value",
-        ).reset_index()
-        pivot.columns.name = None
-        summary = summary.merge(pivot, on="transcript_id", how="left")
+        summary = _left_join_on_transcript(summary, _pivot_scan_values(scans))
 
     if validation_dir is not None:
         validations = load_validations(validation_dir, prefix=validation_prefix)
-        summary = summary.merge(validations, on="transcript_id", how="left")
+        summary = _left_join_on_transcript(summary, validations.set_index("transcript_id"))
 
     return summary
 
 
+def prescreen_recall(
+    scans: pd.DataFrame,
+    validations: pd.DataFrame,
+    validation_column: str,
+    scanner_key: str = "ground_truth_access",
+    positive_at: float = 1,
+    skipped_value: float = -1,
+) -> pd.Series:
+    """Report how many human-flagged transcripts a scanner's pre-screen let through.
+
+    A scanner run with a pre-screen (e.g. ``ground_truth_access`` with
+    ``prescreen_threshold`` set) emits *skipped_value* for transcripts it
+    did not send to the LLM judge.  Recall is the share of validated
+    transcripts with ``target >= positive_at`` that were *not* skipped;
+    anything below 1.0 means the pre-screen hid a real issue from the judge.
+
+    Parameters
+    ----------
+    scans:
+        DataFrame from :func:`load_scan_results`.
+    validations:
+        DataFrame from :func:`load_validations`.
+    validation_column:
+        Validation column holding the human labels for this criterion
+        (e.g. ``"t5_JM"`` for ``swe_bench_t5_JM.csv``).
+    scanner_key:
+        Scanner whose results to check.
+    positive_at:
+        Lowest human ``target`` counted as a real issue.
+    skipped_value:
+        Scanner value marking a transcript skipped by the pre-screen.
+
+    Returns
+    -------
+    pd.Series
+        ``scanned``, ``skipped`` and ``skip_rate`` over all scanned
+        transcripts; ``validated``, ``positives``, ``missed_positives`` and
+        ``recall`` over those with a human label.  ``missed_ids`` lists the
+        skipped positives for review.
+    """
+    if validation_column not in validations.columns:
+        raise KeyError(f"No validation column {validation_column!r}; have {list(validations.columns)}")
+
+    values = scans.loc[scans["scanner_key"] == scanner_key, ["transcript_id", "value_num"]]
+    if values.empty:
+        raise ValueError(f"No results for scanner {scanner_key!r} in scans")
+    # A transcript counts as skipped only if no scan of it reached the judge
+    skipped = (values["value_num"] == skipped_value).groupby(values["transcript_id"]).all()
+
+    labels = validations.set_index("transcript_id")[validation_column]
+    labels = pd.to_numeric(labels, errors="coerce").dropna()
+    labels = labels[labels.index.isin(skipped.index)]
+    positive_ids = labels.index[labels >= positive_at]
+    missed = skipped.reindex(positive_ids).to_numpy(dtype=bool)
+
+    return pd.Series(
+        {
+            "scanned": len(skipped),
+            "skipped": int(skipped.sum()),
+            "skip_rate": float(skipped.mean()),
+            "validated": len(labels),
+            "positives": len(positive_ids),
+            "missed_positives": int(missed.sum()),
+            "recall": float(1 - missed.mean()) if len(positive_ids) else np.nan,
+            "missed_ids": list(positive_ids[missed]),
+        },
+        name=scanner_key,
+    )
+
+
+def pass_rate_intervals(
+    logs: pd.DataFrame,
+    by: str | list[str],
+    value: str = "transcript_success",
+    cluster: str | None = "task_id",
+    alpha: float = 0.05,
+    n_boot: int = 2_000,
+    seed: int = 0,
+    max_elements: int = 1 << 24,
+) -> pd.DataFrame:
+    """Pass rates per group with Wilson, Clopper-Pearson and bootstrap intervals.
+
+    The bootstrap resamples whole *cluster*s (by default tasks, so repeated
+    epochs of one task move together) within each group.  Rows are first
+    reduced to per-(group, cluster) pass and row counts; every group's
+    resamples are then drawn at once as an integer index matrix over the
+    concatenated clusters, and per-group totals come from one
+    ``np.add.reduceat`` per block of resamples (blocks hold at most
+    *max_elements* indices).
+
+    Parameters
+    ----------
+    logs:
+        DataFrame from :func:`load_eval_logs` (or several concatenated,
+        e.g. with an added ``benchmark`` column).
+    by:
+        Column(s) to group by, e.g. ``"benchmark"`` or
+        ``["benchmark", "eval_label"]``.
+    value:
+        Boolean (or 0/1) column to average.  Rows where it is missing are
+        dropped.
+    cluster:
+        Column whose values are resampled as units.  When *None*, rows are
+        resampled independently.
+    alpha:
+        Two-sided level of all intervals.
+    n_boot:
+        Bootstrap resamples per group (0 to skip the bootstrap).
+    seed:
+        Seed for the bootstrap.
+    max_elements:
+        Bound on the resample indices held in memory at once.
+
+    Returns
+    -------
+    pd.DataFrame
+        Indexed by the *by* groups, with columns ``n``, ``passed``,
+        ``clusters``, ``rate``, ``wilson_low``, ``wilson_high``,
+        ``cp_low``, ``cp_high``, ``boot_low`` and ``boot_high``.  The
+        Wilson and Clopper-Pearson intervals treat rows as independent;
+        only the bootstrap accounts for clustering.
+    """
+    from scipy.stats import beta, norm
+
+    by = [by] if isinstance(by, str) else list(by)
+    data = logs.dropna(subset=[value])
+    grouped = data.groupby(by, sort=True, dropna=False)
+    group_codes = grouped.ngroup().to_numpy()
+    index = grouped.size().index
+    n_groups = len(index)
+    y = data[value].to_numpy(dtype=float)
+
+    # Per-(group, cluster) totals, ordered by group so each group's clusters are contiguous
+    if cluster is None:
+        cluster_codes = np.arange(len(data))
+    else:
+        cluster_codes = pd.factorize(data[cluster], use_na_sentinel=False)[0]
+    stride = int(cluster_codes.max(initial=0)) + 1
+    keys, inverse = np.unique(group_codes.astype(np.int64) * stride + cluster_codes, return_inverse=True)
+    cluster_group = keys // stride
+    # float32 holds these integer counts exactly and halves the memory traffic of the bootstrap gathers
+    cluster_passed = np.bincount(inverse, weights=y).astype(np.float32)
+    cluster_rows = np.bincount(inverse).astype(np.float32)
+    clusters = np.bincount(cluster_group, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(clusters)[:-1]])
+
+    n = np.bincount(group_codes, minlength=n_groups)
+    passed = np.bincount(group_codes, weights=y, minlength=n_groups)
+    rate = passed / n
+
+    z = norm.ppf(1 - alpha / 2)
+    center = (rate + z**2 / (2 * n)) / (1 + z**2 / n)
+    half = z * np.sqrt(rate * (1 - rate) / n + z**2 / (4 * n**2)) / (1 + z**2 / n)
+    with np.errstate(invalid="ignore"):
+        cp_low = np.where(passed == 0, 0.0, beta.ppf(alpha / 2, passed, n - passed + 1))
+        cp_high = np.where(passed == n, 1.0, beta.ppf(1 - alpha / 2, passed + 1, n - passed))
+
+    boot_low = boot_high = np.full(n_groups, np.nan)
+    if n_boot:
+        rng = np.random.default_rng(seed)
+        # Position j of a resample draws one of its group's clusters: start + floor(U * clusters)
+        position_start = starts[cluster_group].astype(np.int32)
+        position_count = clusters[cluster_group].astype(np.float32)
+        last = position_count.astype(np.int32) - 1
+        block = max(1, max_elements // len(keys))
+        rates = np.empty((n_boot, n_groups))
+        for first in range(0, n_boot, block):
+            size = min(block, n_boot - first)
+            draws = (rng.random((size, len(keys)), dtype=np.float32) * position_count).astype(np.int32)
+            picks = position_start + np.minimum(draws, last)  # float32 rounding can land on the count itself
+            rates[first:first + size] = (
+                np.add.reduceat(cluster_passed[picks], starts, axis=1)
+                / np.add.reduceat(cluster_rows[picks], starts, axis=1)
+            )
+        boot_low, boot_high = np.quantile(rates, [alpha / 2, 1 - alpha / 2], axis=0)
+
+    return pd.DataFrame(
+        {
+            "n": n,
+            "passed": passed.astype(int),
+            "clusters": clusters,
+            "rate": rate,
+            "wilson_low": center - half,
+            "wilson_high": center + half,
+            "cp_low": cp_low,
+            "cp_high": cp_high,
+            "boot_low": boot_low,
+            "boot_high": boot_high,
+        },
+        index=index,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
 
 
+def _pivot_scan_values(scans: pd.DataFrame) -> pd.DataFrame:
+    """Pivot ``value_num`` to one column per ``scanner_key``, indexed by transcript.
+
+    Equivalent to ``groupby(...).agg("first")`` followed by ``pivot_table``:
+    the first non-null value per (transcript, scanner) wins, transcripts
+    and scanners with no values are dropped, and both axes are sorted.
+    Keys are factorized once and values are scattered into a dense matrix
+    by integer code instead of grouping on strings.
+    """
+    t_codes, t_uniques = pd.factorize(scans["transcript_id"], sort=True)
+    s_codes, s_uniques = pd.factorize(scans["scanner_key"], sort=True)
+    values = scans["value_num"].to_numpy(dtype=float, na_value=np.nan)
+
+    valid = (t_codes >= 0) & (s_codes >= 0) & ~np.isnan(values)
+    t_codes, s_codes, values = t_codes[valid], s_codes[valid], values[valid]
+
+    # Compact codes to the keys that still have a value (keeps sorted order)
+    t_used = np.bincount(t_codes, minlength=len(t_uniques)) > 0
+    s_used = np.bincount(s_codes, minlength=len(s_uniques)) > 0
+    t_codes = (np.cumsum(t_used) - 1)[t_codes]
+    s_codes = (np.cumsum(s_used) - 1)[s_codes]
+    n_t, n_s = int(t_used.sum()), int(s_used.sum())
+
+    # np.unique returns the position of each key's first occurrence
+    _, first = np.unique(t_codes.astype(np.int64) * n_s + s_codes, return_index=True)
+    matrix = np.full((n_t, n_s), np.nan)
+    matrix[t_codes[first], s_codes[first]] = values[first]
+
+    return pd.DataFrame(
+        matrix,
+        index=pd.Index(t_uniques[t_used], name="transcript_id"),
+        columns=pd.Index(s_uniques[s_used]),
+    )
+
+
+def _left_join_on_transcript(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    """Left-join *right* (indexed by ``transcript_id``) onto *left*.
+
+    Behaves like ``left.merge(right.reset_index(), on="transcript_id",
+    how="left")`` but aligns by reindexing when *right* has a unique index
+    and no overlapping column names; otherwise it falls back to ``merge``
+    so duplicate keys and ``_x``/``_y`` suffixes behave as before.
+    """
+    if right.index.has_duplicates or left.columns.intersection(right.columns).size:
+        return left.merge(right.reset_index(), on="transcript_id", how="left")
+    aligned = right.reindex(left["transcript_id"].to_numpy())
+    aligned.index = left.index
+    return pd.concat([left, aligned], axis=1).reset_index(drop=True)
+
+
+def _read_eval_file(eval_file: Path, stream: bool = False) -> list[tuple]:
+    """Extract ``(uuid, id, score)`` for every sample in one ``.eval`` archive.
+
+    The score is the first scorer's raw value; *score_key* and success are
+    applied by the caller.  Module-level so it can be pickled into a
+    :class:`ProcessPoolExecutor`.  With *stream*, samples are decoded
+    incrementally via :func:`_iter_json_array`.
+    """
+    with zipfile.ZipFile(eval_file) as zf:
+        if stream:
+            with zf.open("summaries.json") as fp:
+                return [_summary_fields(s) for s in _iter_json_array(fp)]
+        summaries = json.loads(zf.read("summaries.json"))
+    return [_summary_fields(s) for s in summaries]
+
+
+def _summary_fields(s: dict) -> tuple:
+    """Return ``(uuid, id, first scorer value)`` from one sample summary."""
+    scores = s.get("scores", {})
+    # Take the first scorer's value
+    score_val = None
+    if scores:
+        first_score = next(iter(scores.values()))
+        score_val = first_score.get("value")
+    return (s["uuid"], s["id"], score_val)
+
+
+def _iter_json_array(fp: IO[bytes], chunk_size: int = 1 << 16) -> Iterator:
+    """Yield the elements of a top-level JSON array read incrementally from *fp*.
+
+    Elements are decoded one at a time with :meth:`json.JSONDecoder.raw_decode`
+    so only the current element and a read buffer are held in memory.  When
+    an element straddles the buffer end, the next read is at least as large
+    as the pending text, so a long element is re-scanned O(log n) times.
+    """
+    decoder = json.JSONDecoder()
+    reader = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill(min_size: int) -> None:
+        nonlocal buf, pos, eof
+        data = fp.read(max(chunk_size, min_size))
+        eof = not data
+        buf = buf[pos:] + reader.decode(data, final=eof)
+        pos = 0
+
+    def skip(chars: str) -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill(chunk_size)
+
+    skip(" \t\r\n")
+    if pos >= len(buf) or buf[pos] != "[":
+        raise ValueError("summaries.json is not a JSON array")
+    pos += 1
+    while True:
+        skip(" \t\r\n,")
+        if pos >= len(buf):
+            raise ValueError("summaries.json ended before the closing ']'")
+        if buf[pos] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill(len(buf) - pos)
+            continue
+        # Only accept the element once its delimiter is buffered; a number
+        # such as 1.5e3 split across chunks would otherwise decode as 1
+        nxt = end
+        while nxt < len(buf) and buf[nxt] in " \t\r\n":
+            nxt += 1
+        if nxt == len(buf) or buf[nxt] not in ",]":
+            if eof:
+                raise ValueError("summaries.json has malformed array separators")
+            fill(len(buf) - pos)
+            continue
+        pos = nxt
+        yield value
+
+
+def _read_eval_files(
+    eval_files: list[Path],
+    workers: int | None,
+    stream: bool = False,
+) -> list[list[tuple]]:
+    """Run :func:`_read_eval_file` over *eval_files*, optionally in a process pool."""
+    if workers is not None and workers > 1 and len(eval_files) > 1:
+        # Large chunks keep pickling overhead small relative to archive parsing
+        chunksize = max(1, len(eval_files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(
+                pool.map(
+                    _read_eval_file,
+                    eval_files,
+                    [stream] * len(eval_files),
+                    chunksize=chunksize,
+                )
+            )
+    return [_read_eval_file(f, stream) for f in eval_files]
+
+
+def _cached_summaries(
+    eval_logs_dir: Path,
+    eval_files: list[Path],
+    workers: int | None,
+    stream: bool = False,
+) -> list[list[tuple]]:
+    """Return :func:`_read_eval_file` output per file, re-reading only stale archives.
+
+    Entries are keyed by the archive path relative to *eval_logs_dir* and
+    invalidated when its size or ``st_mtime_ns`` changes; entries for
+    archives no longer on disk are dropped.  If the cache cannot be opened
+    (e.g. a read-only directory) every archive is read directly and a
+    warning is emitted.
+    """
+    cache_path = eval_logs_dir / EVAL_CACHE_NAME
+    try:
+        conn = sqlite3.connect(cache_path)
+    except sqlite3.Error as exc:
+        warnings.warn(f"Summary cache unavailable at {cache_path} ({exc}); reading archives directly")
+        return _read_eval_files(eval_files, workers, stream)
+
+    try:
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files "
+                "(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER)"
+            )
+            # No declared types on task_id so sqlite keeps int ids as ints
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS samples "
+                "(path TEXT, ord INTEGER, transcript_id TEXT, task_id, score TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS samples_path ON samples (path)")
+
+        known = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in conn.execute("SELECT path, size, mtime_ns FROM files")
+        }
+        keys: list[str] = []
+        stale: list[tuple[int, str, tuple[int, int]]] = []
+        for i, eval_file in enumerate(eval_files):
+            key = eval_file.relative_to(eval_logs_dir).as_posix()
+            st = os.stat(eval_file)
+            stamp = (st.st_size, st.st_mtime_ns)
+            keys.append(key)
+            if known.get(key) != stamp:
+                stale.append((i, key, stamp))
+
+        # Archives that were deleted or renamed; excluded ones still on disk keep their entries
+        current = set(keys)
+        gone = [(key,) for key in known if key not in current and not (eval_logs_dir / key).exists()]
+        if gone:
+            with conn:
+                conn.executemany("DELETE FROM samples WHERE path = ?", gone)
+                conn.executemany("DELETE FROM files WHERE path = ?", gone)
+
+        per_file: list[list[tuple] | None] = [None] * len(eval_files)
+        if stale:
+            fresh = _read_eval_files([eval_files[i] for i, _, _ in stale], workers, stream)
+            with conn:
+                for (i, key, (size, mtime_ns)), summaries in zip(stale, fresh):
+                    conn.execute("DELETE FROM samples WHERE path = ?", (key,))
+                    conn.executemany(
+                        "INSERT INTO samples VALUES (?, ?, ?, ?, ?)",
+                        (
+                            (key, n, uuid, task_id, json.dumps(score))
+                            for n, (uuid, task_id, score) in enumerate(summaries)
+                        ),
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?)",
+                        (key, size, mtime_ns),
+                    )
+                    per_file[i] = summaries
+
+        wanted = {key: i for i, key in enumerate(keys) if per_file[i] is None}
+        if wanted:
+            for i in wanted.values():
+                per_file[i] = []
+            # Scores repeat heavily ("C"/"I", 0/1), so decode each distinct one once
+            decoded: dict[str, object] = {}
+            for path, uuid, task_id, score in conn.execute(
+                "SELECT path, transcript_id, task_id, score FROM samples ORDER BY path, ord"
+            ):
+                i = wanted.get(path)
+                if i is None:
+                    continue
+                if score not in decoded:
+                    decoded[score] = json.loads(score)
+                per_file[i].append((uuid, task_id, decoded[score]))
+    finally:
+        conn.close()
+    return per_file
+
+
+def _read_csv_columns(csv_path: Path, wanted: set[str]) -> pd.DataFrame | None:
+    """Read only the *wanted* columns of a CSV, or *None* if it has no ``id``.
+
+    The header is sniffed with :mod:`csv` first so files without the
+    expected columns are skipped without being parsed; the body is read
+    with :func:`pyarrow.csv.read_csv`, which skips conversion of every
+    other column (e.g. long free-text notes).  As with
+    :func:`pandas.read_csv`, a UTF-8 byte order mark is ignored and empty
+    strings read as missing.
+    """
+    with open(csv_path, newline="", encoding="utf-8-sig") as fh:
+        header = next(csv.reader(fh), [])
+    present = [c for c in header if c in wanted]
+    if "id" not in present:
+        return None
+    table = pa_csv.read_csv(
+        csv_path,
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(include_columns=present, strings_can_be_null=True),
+    )
+    return table.to_pandas()
+
+
+def _indexed_scan_parts(
+    scan_results_dir: Path,
+    all_scan_dirs: list[Path],
+    scan_dirs: list[Path],
+) -> list[str]:
+    """Bring the scan index up to date for *scan_dirs* and return their parts.
+
+    The manifest maps each scan directory (relative to *scan_results_dir*)
+    to the size and ``st_mtime_ns`` of its parquet files and ``_scan.json``,
+    the compacted part file, and the parsed ``_scan.json``.  A directory is
+    re-ingested only when those stamps change; entries for directories that
+    no longer exist are dropped.
+    """
+    index_dir = scan_results_dir / SCAN_INDEX_NAME
+    manifest_path = index_dir / "manifest.json"
+    manifest = {"scans": {}}
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+    entries: dict[str, dict] = manifest["scans"]
+    changed = False
+
+    existing = {d.relative_to(scan_results_dir).as_posix() for d in all_scan_dirs}
+    for key in [k for k in entries if k not in existing]:
+        part = entries.pop(key)["part"]
+        if part is not None:
+            (index_dir / part).unlink(missing_ok=True)
+        changed = True
+
+    parts: list[str] = []
+    for scan_dir in scan_dirs:
+        key = scan_dir.relative_to(scan_results_dir).as_posix()
+        stamp = {
+            p.name: [p.stat().st_size, p.stat().st_mtime_ns]
+            for p in sorted(scan_dir.iterdir())
+            if p.suffix == ".parquet" or p.name == "_scan.json"
+        }
+        entry = entries.get(key)
+        if entry is None or entry["files"] != stamp:
+            entry = _ingest_scan_dir(scan_dir, index_dir, key, stamp)
+            entries[key] = entry
+            changed = True
+        if entry["part"] is not None:
+            parts.append(str(index_dir / entry["part"]))
+
+    if changed:
+        index_dir.mkdir(exist_ok=True)
+        tmp_path = manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=1))
+        os.replace(tmp_path, manifest_path)
+    return parts
+
+
+def _ingest_scan_dir(scan_dir: Path, index_dir: Path, key: str, stamp: dict) -> dict:
+    """Compact one ``scan_id=*`` directory into a single parquet part."""
+    scan_json = scan_dir / "_scan.json"
+    entry = {
+        "files": stamp,
+        "part": None,
+        "scan": json.loads(scan_json.read_text()) if scan_json.exists() else None,
+    }
+    pq_paths = [str(p) for p in sorted(scan_dir.glob("*.parquet"))]
+    if not pq_paths:
+        return entry
+
+    table = ds.dataset(pq_paths, schema=_unified_schema(pq_paths), format="parquet").to_table()
+    part = f"part-{hashlib.sha1(key.encode()).hexdigest()[:16]}.parquet"
+    index_dir.mkdir(exist_ok=True)
+    tmp_path = index_dir / f"{part}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, index_dir / part)
+    entry["part"] = part
+    return entry
+
+
+_FRAGMENT_KEY = ["scan_id", "scanner_key", "transcript_id"]
+
+
+def _drop_superseded_fragments(table: pa.Table) -> pa.Table:
+    """Keep only each (scan, scanner, transcript)'s rows from its newest fragment.
+
+    Rows without a fragment (scans not written by ``tools/batch_scan.py``)
+    are always kept.
+    """
+    fragment = table["fragment"]
+    if fragment.null_count == len(table):
+        return table
+    fragmented = table.select([*_FRAGMENT_KEY, "fragment"]).filter(pc.is_valid(fragment))
+    newest = fragmented.group_by(_FRAGMENT_KEY).aggregate([("fragment", "max")])
+    if len(newest) == len(fragmented):
+        return table  # every fragmented pair was written exactly once
+    row_ids = pa.array(np.arange(len(table)))
+    keyed = table.select(_FRAGMENT_KEY).append_column("__row", row_ids).append_column("fragment", fragment)
+    joined = keyed.join(newest, _FRAGMENT_KEY)
+    keep = pc.or_kleene(pc.is_null(joined["fragment"]), pc.equal(joined["fragment"], joined["fragment_max"]))
+    kept_rows = pc.filter(joined["__row"], keep).to_numpy()
+    return table.take(np.sort(kept_rows))
+
+
+def _unified_schema(pq_paths: list[str]) -> pa.Schema:
+    """Merge the schemas of *pq_paths* from their parquet footers.
+
+    Scanners write different ``value`` types (bool for ``grading_*``,
+    integers or floats for LLM judges).  Fields whose types disagree are
+    read as float64 when every variant is numeric or bool (so ``True``
+    still becomes ``1.0`` in ``value_num``), and as strings otherwise
+    (bools then read as ``"true"``/``"false"``, which :func:`_value_num`
+    maps back to 1/0).
+    """
+    fields: dict[str, pa.Field] = {}
+    for pq_path in pq_paths:
+        for field in pq.read_schema(pq_path):
+            seen = fields.get(field.name)
+            if seen is None or seen.type == field.type or pa.types.is_null(field.type):
+                fields.setdefault(field.name, field)
+                continue
+            if pa.types.is_null(seen.type):
+                fields[field.name] = field
+            elif all(
+                pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_boolean(t)
+                for t in (seen.type, field.type)
+            ):
+                fields[field.name] = pa.field(field.name, pa.float64())
+            else:
+                fields[field.name] = pa.field(field.name, pa.string())
+    return pa.schema(list(fields.values()))
+
+
+def _value_num(value: pd.Series) -> pd.Series:
+    """``value`` cast to float, with bools read as strings counted as 1/0."""
+    value_num = pd.to_numeric(value, errors="coerce")
+    if not pd.api.types.is_numeric_dtype(value):
+        value_num = value_num.fillna(value.map({"true": 1.0, "false": 0.0}).astype(float))
+    return value_num
+
+
 def _label_from_path(eval_file: Path, segment: str) -> str:
     """Extract an eval label from a file path based on a directory segment.
 
@@ -262,3 +1111,23 @@ def _is_success(score_value) -> bool:
     if isinstance(score_value, str):
         return score_value == "C"
     return float(score_value) > 0
+
+
+def _is_success_vectorized(scores: list) -> np.ndarray:
+    """Apply :func:`_is_success` to a whole column at once.
+
+    Homogeneous string or numeric columns (the common case) are compared
+    without a Python-level loop; anything mixed falls back to calling
+    :func:`_is_success` per value so edge cases behave identically.
+    """
+    values = np.empty(len(scores), dtype=object)
+    values[:] = scores
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind == "empty":
+        return np.zeros(len(values), dtype=bool)
+    if kind == "string":
+        return values == "C"
+    if kind in ("integer", "floating", "mixed-integer-float", "boolean"):
+        numeric = pd.to_numeric(pd.Series(values), errors="raise").astype(float)
+        return np.asarray(numeric > 0, dtype=bool)
+    return np.fromiter((_is_success(v) for v in values), dtype=bool, count=len(values))
@@ -0,0 +1,60 @@
+"""Synthetic inputs shared by the benchmark scripts in this directory."""
+
+import json
+import random
+import sys
+import uuid
+import zipfile
+from pathlib import Path
+
+ANALYSIS_DIR = Path(__file__).resolve().parents[1] / "analysis"
+SCORE_MIXES = {
+    "str": ["C", "I", None],
+    "numeric": [0, 1, 0.5, None, True],
+    "mixed": ["C", 1, 0.0, None],
+    "dict": [{"above_median": 1}, {"above_median": 0}, {"above_median": None}],
+}
+
+
+def import_scan_utils():
+    """Import analysis/scan_utils.py the way the notebooks do."""
+    sys.path.insert(0, str(ANALYSIS_DIR))
+    import scan_utils
+
+    return scan_utils
+
+
+def write_eval_tree(
+    root: Path,
+    n_files: int,
+    n_samples: int,
+    scores: str = "str",
+    score_bytes: int = 0,
+    seed: int = 0,
+) -> Path:
+    """Write n_files .eval archives of n_samples summaries each under root/synth/exp<k>/.
+
+    scores picks the score values from SCORE_MIXES; score_bytes pads every score with an explanation and metadata
+    of about that size, as verbose scorers produce.
+    """
+    rng = random.Random(seed)
+    choices = SCORE_MIXES[scores]
+    padding = {}
+    if score_bytes:
+        padding = {"explanation": "x" * (score_bytes // 2), "metadata": {"log": "y" * (score_bytes // 2)}}
+    for i in range(n_files):
+        exp_dir = root / "synth" / f"exp{i % 4}"
+        exp_dir.mkdir(parents=True, exist_ok=True)
+        summaries = [
+            {
+                "uuid": str(uuid.UUID(int=rng.getrandbits(128))),
+                "id": f"task{j}",
+                "epoch": 1,
+                "scores": {"scorer": {"value": rng.choice(choices), **padding}},
+            }
+            for j in range(n_samples)
+        ]
+        with zipfile.ZipFile(exp_dir / f"log{i}.eval", "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("summaries.json", json.dumps(summaries))
+            zf.writestr("header.json", "{}")
+    return root
@@ -0,0 +1,71 @@
+"""Row assembly in load_eval_logs: column-wise build with vectorized success vs one dict per transcript.
+
+For each mix of score values (see _synthetic.SCORE_MIXES) a tree of archives is written and parsed once. The
+same parsed summaries are then fed to load_eval_logs (archive reading is stubbed out, so only the row assembly
+and DataFrame build are timed) and to the per-row loop load_eval_logs used before, and the outputs compared.
+
+    uv run python benchmarks/bench_eval_logs_rows.py --files 200 --samples 500
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from _synthetic import SCORE_MIXES, import_scan_utils, write_eval_tree
+
+
+def rows_per_transcript(scan_utils, root: Path, eval_files: list[Path], per_file: list, score_key: str | None):
+    """The previous assembly: one dict per transcript, success checked value by value."""
+    rows: list[dict] = []
+    for eval_file, summaries in zip(eval_files, per_file):
+        label = scan_utils._label_from_path(eval_file, "synth")
+        for transcript_id, task_id, score_val in summaries:
+            if score_key is not None and isinstance(score_val, dict):
+                score_val = score_val.get(score_key)
+            rows.append({
+                "transcript_id": transcript_id,
+                "task_id": task_id,
+                "transcript_score": score_val,
+                "transcript_success": scan_utils._is_success(score_val),
+                "eval_file": str(eval_file.relative_to(root)),
+                "eval_label": label,
+            })
+    return pd.DataFrame(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200, help="Number of .eval archives")
+    parser.add_argument("--samples", type=int, default=500, help="Samples per archive")
+    args = parser.parse_args()
+    scan_utils = import_scan_utils()
+    read_eval_files = scan_utils._read_eval_files
+
+    print(f"{args.files} archives x {args.samples} samples, row assembly only")
+    for mix in SCORE_MIXES:
+        score_key = "above_median" if mix == "dict" else None
+        with tempfile.TemporaryDirectory() as tmp:
+            root = write_eval_tree(Path(tmp), args.files, args.samples, scores=mix)
+            eval_files = sorted(root.rglob("*.eval"))
+            per_file = read_eval_files(eval_files, None)
+
+            started = time.perf_counter()
+            expected = rows_per_transcript(scan_utils, root, eval_files, per_file, score_key)
+            per_row_seconds = time.perf_counter() - started
+
+            scan_utils._read_eval_files = lambda *_args, **_kwargs: per_file
+            try:
+                started = time.perf_counter()
+                actual = scan_utils.load_eval_logs(root, score_key=score_key, cache=False)
+                column_seconds = time.perf_counter() - started
+            finally:
+                scan_utils._read_eval_files = read_eval_files
+        pd.testing.assert_frame_equal(actual, expected)
+        print(f"  {mix:<8} per-row {per_row_seconds * 1000:6.0f}ms -> column-wise {column_seconds * 1000:5.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
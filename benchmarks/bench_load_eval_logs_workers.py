@@ -0,0 +1,44 @@
+"""Sequential vs process-pool load_eval_logs(workers=...) on a synthetic tree of .eval archives.
+
+Both runs bypass the summaries cache, so every archive is opened and parsed; the outputs must be identical.
+The pool only pays off with more than one CPU.
+
+    uv run python benchmarks/bench_load_eval_logs_workers.py --files 2000 --samples 50 --workers 4
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from _synthetic import import_scan_utils, write_eval_tree
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000, help="Number of .eval archives")
+    parser.add_argument("--samples", type=int, default=50, help="Samples per archive")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    scan_utils = import_scan_utils()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_eval_tree(Path(tmp), args.files, args.samples)
+        timings = {}
+        outputs = {}
+        for workers in (None, args.workers):
+            started = time.perf_counter()
+            outputs[workers] = scan_utils.load_eval_logs(root, workers=workers, cache=False)
+            timings[workers] = time.perf_counter() - started
+        pd.testing.assert_frame_equal(outputs[None], outputs[args.workers])
+
+    rows = len(outputs[None])
+    print(f"{args.files} archives x {args.samples} samples ({rows} rows), outputs identical")
+    print(f"  sequential      {timings[None]:.2f}s")
+    print(f"  workers={args.workers:<7d} {timings[args.workers]:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""load_validations (column-pruned reads, one aligned concat) vs the per-CSV read_csv + outer-merge chain.
+
+Writes a directory of validation CSVs like the swe_bench_*.csv files (id, target, a free-text notes column),
+loads it both ways and checks the outputs match.
+
+    uv run python benchmarks/bench_load_validations.py --csvs 300 --rows 2000 --notes-chars 300
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from _synthetic import import_scan_utils
+
+
+def write_validation_dir(root: Path, n_csvs: int, n_rows: int, notes_chars: int, seed: int = 0) -> Path:
+    rng = random.Random(seed)
+    ids = [f"transcript-{i:06d}" for i in range(n_rows * 2)]
+    for i in range(n_csvs):
+        frame = pd.DataFrame({
+            "id": rng.sample(ids, n_rows),
+            "target": [rng.choice([0, 1, 2, 3]) for _ in range(n_rows)],
+            "notes": ["".join(rng.choices("abcdef ,\n", k=notes_chars)) for _ in range(n_rows)],
+        })
+        frame.to_csv(root / f"swe_bench_check{i:03d}.csv", index=False)
+    return root
+
+
+def merge_chain(validation_dir: Path, prefix: str = "swe_bench_") -> pd.DataFrame:
+    """The previous loader: read every CSV in full and outer-merge them one at a time."""
+    result = None
+    for csv_path in sorted(validation_dir.rglob("*.csv")):
+        df = pd.read_csv(csv_path)
+        if "id" not in df.columns or "target" not in df.columns:
+            continue
+        col_name = csv_path.stem
+        if col_name.startswith(prefix):
+            col_name = col_name[len(prefix):]
+        val = df[["id", "target"]].rename(columns={"id": "transcript_id", "target": col_name})
+        result = val if result is None else result.merge(val, on="transcript_id", how="outer")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csvs", type=int, default=300, help="Number of validation CSVs")
+    parser.add_argument("--rows", type=int, default=2000, help="Rows per CSV")
+    parser.add_argument("--notes-chars", type=int, default=300, help="Length of each row's notes text")
+    args = parser.parse_args()
+    scan_utils = import_scan_utils()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_validation_dir(Path(tmp), args.csvs, args.rows, args.notes_chars)
+        started = time.perf_counter()
+        expected = merge_chain(root)
+        merge_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        actual = scan_utils.load_validations(root)
+        load_seconds = time.perf_counter() - started
+    pd.testing.assert_frame_equal(actual, expected)
+
+    print(f"{args.csvs} CSVs x {args.rows} rows with {args.notes_chars}-char notes, outputs identical")
+    print(f"  read_csv + merge chain  {merge_seconds:.2f}s")
+    print(f"  load_validations        {load_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
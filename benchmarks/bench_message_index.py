@@ -0,0 +1,141 @@
+"""Prompt sections from the one-pass MessageIndex vs per-role rescans of transcript.messages.
+
+Builds synthetic agent transcripts and renders, for each, every section the LLM prompt builders read (system/user
+text, cited variants, the final message, the preceding-assistant windows and the tool positions walked by
+command_not_found). RescanSections reproduces the previous TranscriptSections, which filtered the whole message
+list once per role and again for every preceding-assistant window. Both must render the same text.
+
+    uv run python benchmarks/bench_message_index.py --transcripts 20 --messages 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+
+from inspect_ai.model import ChatMessageAssistant, ChatMessageSystem, ChatMessageTool, ChatMessageUser
+from inspect_ai.tool import ToolCall
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import scanners  # noqa: E402
+
+TOOL_OUTPUTS = [
+    "ls: src tests setup.py",
+    "bash: line 1: foo: command not found",
+    "Traceback (most recent call last):\nModuleNotFoundError: No module named 'numpy'",
+    "ok",
+]
+
+
+@dataclass
+class SyntheticTranscript:
+    """The transcript fields TranscriptSections reads."""
+
+    transcript_id: str
+    messages: list
+    metadata: dict = field(default_factory=dict)
+    success: bool = False
+
+
+def make_transcript(transcript_id: str, n_messages: int, seed: int) -> SyntheticTranscript:
+    rng = random.Random(seed)
+    messages = [ChatMessageSystem(content="You are a helpful agent."), ChatMessageUser(content="Fix the issue.")]
+    step = 0
+    while len(messages) < n_messages:
+        step += 1
+        if rng.random() < 0.8:
+            call = ToolCall(id=f"call{step}", function="bash", arguments={"cmd": f"run step {step}"})
+            messages.append(ChatMessageAssistant(content=f"Running step {step}.", tool_calls=[call]))
+            messages.append(ChatMessageTool(content=rng.choice(TOOL_OUTPUTS), tool_call_id=call.id, function="bash"))
+        else:
+            messages.append(ChatMessageUser(content="Please continue."))
+    messages.append(ChatMessageAssistant(content="Done."))
+    return SyntheticTranscript(transcript_id, messages)
+
+
+class RescanSections(scanners.TranscriptSections):
+    """TranscriptSections as it was before MessageIndex: one filter over all messages per role and per window."""
+
+    @cached_property
+    def system_text(self) -> str:
+        return "\n".join(m.text for m in self.transcript.messages if m.role == "system")
+
+    @cached_property
+    def user_text(self) -> str:
+        return "\n".join(m.text for m in self.transcript.messages if m.role == "user")
+
+    @cached_property
+    def system_text_cited(self) -> str:
+        return "\n".join(f"[M{i}] {m.text}" for i, m in self.system_msgs)
+
+    @cached_property
+    def user_text_cited(self) -> str:
+        return "\n".join(f"[M{i}] {m.text}" for i, m in self.user_msgs)
+
+    @cached_property
+    def system_msgs(self) -> list[tuple[int, object]]:
+        return [(i, m) for i, m in enumerate(self.transcript.messages) if m.role == "system"]
+
+    @cached_property
+    def user_msgs(self) -> list[tuple[int, object]]:
+        return [(i, m) for i, m in enumerate(self.transcript.messages) if m.role == "user"]
+
+    @cached_property
+    def final_idx(self) -> int | None:
+        return len(self.transcript.messages) - 1 if self.transcript.messages else None
+
+    def preceding_assistant(self, k: int) -> list[tuple[int, object]]:
+        return [(i, m) for i, m in enumerate(self.transcript.messages[:-1]) if m.role == "assistant"][-k:]
+
+    @property
+    def tool_positions(self) -> list[int]:
+        return [i for i, m in enumerate(self.transcript.messages) if m.role == "tool"]
+
+
+def render(sections: scanners.TranscriptSections) -> tuple:
+    """Every section the prompt builders and command_not_found read, as they read them."""
+    tool_positions = (
+        sections.tool_positions if isinstance(sections, RescanSections) else sections.index.by_role["tool"]
+    )
+    return (
+        sections.system_text,
+        sections.user_text,
+        sections.system_text_cited,
+        sections.user_text_cited,
+        sections.final_text,
+        sections.final_text_cited,
+        sections.preceding_text(4),
+        sections.preceding_text(5, cite=True, redacted_placeholder="REDACTED"),
+        [i for i, _ in sections.preceding_assistant(5)],
+        list(tool_positions),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transcripts", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=5000, help="Messages per transcript")
+    parser.add_argument("--repeat", type=int, default=5, help="Renders per transcript (best time is kept)")
+    args = parser.parse_args()
+
+    transcripts = [make_transcript(f"T{i}", args.messages, seed=i) for i in range(args.transcripts)]
+    best = {}
+    for name, sections_class in (("per-role rescans", RescanSections), ("MessageIndex", scanners.TranscriptSections)):
+        times = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            rendered = [render(sections_class(t)) for t in transcripts]
+            times.append(time.perf_counter() - started)
+        best[name] = (min(times), rendered)
+    assert best["per-role rescans"][1] == best["MessageIndex"][1], "sections differ"
+
+    print(f"{args.transcripts} transcripts x {args.messages} messages, sections identical")
+    for name, (seconds, _) in best.items():
+        print(f"  {name:<17} {seconds / args.transcripts * 1000:.2f} ms / transcript")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Peak memory of load_eval_logs with summaries.json parsed whole (default) vs stream=True.
+
+Each mode runs in its own process, so peak RSS is not shared between them; "import only" is the footprint of
+pandas and scan_utils before any archive is read. The archives carry large per-sample score dicts (explanations,
+metadata), which is where the full json.loads parse spends its memory.
+
+    uv run python benchmarks/bench_stream_summaries.py --files 3 --samples 500 --score-kb 70
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _synthetic import import_scan_utils, write_eval_tree
+
+MODES = ["import only", "json.loads", "stream=True"]
+
+
+def peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+def child(mode: str, root: str) -> None:
+    import pandas as pd
+
+    scan_utils = import_scan_utils()
+    result = {"mode": mode, "seconds": 0.0, "digest": None}
+    if mode != "import only":
+        started = time.perf_counter()
+        logs = scan_utils.load_eval_logs(root, cache=False, stream=mode == "stream=True")
+        result["seconds"] = time.perf_counter() - started
+        result["digest"] = int(pd.util.hash_pandas_object(logs.astype(str)).sum())
+    result["peak_rss_mib"] = peak_rss_mib()
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=3, help="Number of .eval archives")
+    parser.add_argument("--samples", type=int, default=500, help="Samples per archive")
+    parser.add_argument("--score-kb", type=int, default=70, help="Approximate size of each sample's score dict")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "ROOT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_eval_tree(Path(tmp), args.files, args.samples, score_bytes=args.score_kb * 1024)
+        results = [
+            json.loads(subprocess.run(
+                [sys.executable, __file__, "--child", mode, str(root)], check=True, capture_output=True, text=True
+            ).stdout)
+            for mode in MODES
+        ]
+    digests = {r["digest"] for r in results if r["digest"] is not None}
+    assert len(digests) == 1, "stream=True output differs from json.loads"
+
+    print(f"{args.files} archives x {args.samples} samples, ~{args.score_kb} KB scores each, outputs identical")
+    for r in results:
+        print(f"  {r['mode']:<12} peak RSS {r['peak_rss_mib']:7.1f} MiB  {r['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Sample-size formulas from the sample_calc_*.ipynb notebooks, importable from scripts and other notebooks.
+
+    from sample_calc import n_required, n_detect_one, cp_two_sided, cp_lower_one_sided
+
+Every formula broadcasts over NumPy arrays (scalars in, scalars out), and the grid_* helpers evaluate them over
+the full cartesian product of their parameter lists in one shot, returning the same DataFrames the notebooks
+built row by row with nested loops. A 10^6-cell n_required or n_detect_one grid takes well under a second; the
+Clopper-Pearson functions cost about a microsecond per cell and bound (scipy's beta quantile), so size their
+grids accordingly.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.special import betainc
+from scipy.stats import beta, norm
+
+
+def n_required(p, se, sp=1.0, m=0.01, alpha=0.05, N=None, deff=1.0):
+    """
+    Required n so that approx (1-alpha) CI half-width for corrected p-hat is <= m.
+    Assumes Se, Sp known (no uncertainty in calibration).
+    Optionally applies finite population correction for sampling without replacement from N.
+    Optionally inflates by design effect deff (e.g., grader clustering).
+    All arguments broadcast; array cells where Se + Sp <= 1 are NaN (a scalar call raises instead).
+    """
+    z = norm.ppf(1 - np.asarray(alpha)/2)
+    denom = (np.asarray(se) + sp - 1.0)
+    if denom.ndim == 0 and denom <= 0:
+        raise ValueError("Se + Sp must exceed 1 (otherwise correction is not identifiable).")
+
+    q = p*se + (1-p)*(1-sp)  # observed positive rate
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n0 = np.where(denom > 0, (z**2 * q * (1 - q)) / (m**2 * denom**2), np.nan)
+
+    # finite population correction (closed form)
+    if N is not None:
+        n0 = (N * n0) / (N + n0 - 1)
+
+    return _scalar_or_array(np.ceil(n0 * deff))
+
+
+def n_detect_one(p_0, se, alpha=0.05):
+    """
+    Calculate minimum n to have (1-alpha) probability of detecting at least one true positive.
+
+    The probability of detecting at least one TP in n samples is: 1 - (1 - p_0 * Se)^n
+    Setting this >= 1-alpha and solving for n gives: n >= ln(alpha) / ln(1 - p_0 * Se)
+
+    Parameters
+    ----------
+    p_0 : float or array
+        True prevalence (base rate), 0 < p_0 < 1
+    se : float or array
+        Sensitivity (true positive rate), 0 < se <= 1
+    alpha : float or array
+        Probability of failing to detect any positives (default 0.05 for 95% confidence)
+
+    Returns
+    -------
+    float or array
+        Minimum sample size (ceiling); inf where p_0 * se is not in (0, 1)
+    """
+    detection_prob = np.asarray(p_0) * se
+    valid = (detection_prob > 0) & (detection_prob < 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n = np.log(alpha) / np.log(1 - np.where(valid, detection_prob, 0.5))
+    return _scalar_or_array(np.where(valid, np.ceil(n), np.inf))
+
+
+# x here is the number of identified positives (TP), n is to total number of positives in the dataset (so n-x false negatives)
+def cp_two_sided(x, n, alpha=0.05):
+    """Clopper-Pearson (exact) two-sided (1-alpha) interval for x successes out of n; broadcasts over x and n."""
+    x, n = np.asarray(x), np.asarray(n)
+    with np.errstate(invalid="ignore"):
+        lower = np.where(x == 0, 0.0, beta.ppf(alpha/2, x, n - x + 1))
+        upper = np.where(x == n, 1.0, beta.ppf(1 - alpha/2, x + 1, n - x))
+    return _scalar_or_array(lower), _scalar_or_array(upper)
+
+
+def cp_lower_one_sided(x, n, alpha=0.05):
+    """Clopper-Pearson one-sided (1-alpha) lower confidence bound for x successes out of n; broadcasts."""
+    x, n = np.asarray(x), np.asarray(n)
+    with np.errstate(invalid="ignore"):
+        return _scalar_or_array(np.where(x == 0, 0.0, beta.ppf(alpha, x, n - x + 1)))
+
+
+def n_required_exact(p, m, alpha=0.05, one_sided=False, n_max=10**7):
+    """
+    Smallest n whose exact (Clopper-Pearson) interval at the expected count x = n*p stays within m of p.
+
+    The exact-binomial counterpart of the normal-approximation n_required with perfect graders. Two-sided,
+    both bounds must be within m; with one_sided=True only the (1-alpha) lower bound (cp_lower_one_sided) must
+    be at least p - m. Solved for every cell at once by integer bisection on n, testing the bounds through the
+    beta CDF (L >= p - m  <=>  I_{p-m}(x, n-x+1) <= alpha/2) rather than inverting it.
+
+    Parameters
+    ----------
+    p : float or array
+        Expected proportion (e.g. sensitivity), 0 < p < 1
+    m : float or array
+        Target distance from p to the bound(s)
+    alpha : float or array
+        1 - confidence
+    one_sided : bool
+        Only constrain the lower bound
+    n_max : int
+        Give up above this n (those cells are inf)
+
+    Returns
+    -------
+    float or array
+        Required sample size
+    """
+    p, m, alpha = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (p, m, alpha)))
+    tail = alpha if one_sided else alpha / 2
+
+    def within(n):
+        x = n * p
+        with np.errstate(invalid="ignore"):
+            ok = (p - m <= 0) | (betainc(x, n - x + 1, np.clip(p - m, 0, 1)) <= tail)
+            if not one_sided:
+                ok &= (p + m >= 1) | (betainc(x + 1, np.maximum(n - x, 1e-12), np.clip(p + m, 0, 1)) >= 1 - tail)
+        return ok
+
+    # Bracket from the normal approximation, doubling hi until every cell's bound is met (or n_max is reached)
+    z = norm.ppf(1 - tail)
+    hi = np.clip(np.ceil(2 * z**2 * p * (1 - p) / m**2), 2, n_max)
+    for _ in range(64):
+        short = ~within(hi) & (hi < n_max)
+        if not short.any():
+            break
+        hi = np.where(short, np.minimum(hi * 2, n_max), hi)
+    reachable = within(hi)
+    lo = np.zeros_like(hi)  # invariant: within(lo) is False (n = 0 never qualifies), within(hi) is True
+    while True:
+        gap = reachable & (hi - lo > 1)
+        if not gap.any():
+            break
+        mid = np.floor((lo + hi) / 2)
+        ok = within(np.where(gap, mid, hi))
+        hi = np.where(gap & ok, mid, hi)
+        lo = np.where(gap & ~ok, mid, lo)
+    return _scalar_or_array(np.where(reachable, hi, np.inf))
+
+
+def grid_table(ps, ses, sps, ms, alpha=0.05, N=None, deff=1.0):
+    """
+    Generate a DataFrame of required sample sizes across parameter combinations.
+    Rows are in the order of nested loops over ps, ses, sps, ms.
+    """
+    p, se, sp, m = (a.ravel() for a in np.meshgrid(ps, ses, sps, ms, indexing="ij"))
+    n = n_required(p, se, sp, m, alpha=alpha, N=N, deff=deff)
+    return pd.DataFrame({'p': p, 'sensitivity': se, 'specificity': sp, 'm': m, 'n_required': n})
+
+
+def grid_n_detect_one(p_0s, ses, alpha=0.05):
+    """
+    Generate a DataFrame of required sample sizes for detecting at least one true positive.
+    """
+    p_0, se = (a.ravel() for a in np.meshgrid(p_0s, ses, indexing="ij"))
+    return pd.DataFrame({'p_0': p_0, 'sensitivity': se, 'n_required': n_detect_one(p_0, se, alpha)})
+
+
+def grid_cp(ses, n_values, alpha=0.05):
+    """
+    Clopper-Pearson bounds at x = int(n * se) for every (sensitivity, n) pair: the two-sided interval, its
+    lower half-width (se - lower) and the one-sided lower bound.
+    """
+    se, n = (a.ravel() for a in np.meshgrid(ses, n_values, indexing="ij"))
+    x = np.trunc(n * se).astype(int)
+    lower, upper = cp_two_sided(x, n, alpha)
+    return pd.DataFrame({
+        'sensitivity': se,
+        'n': n,
+        'x': x,
+        'lower': lower,
+        'upper': upper,
+        'half_width': se - lower,
+        'lower_bound': cp_lower_one_sided(x, n, alpha),
+    })
+
+
+def grid_n_required_exact(ps, ms, alpha=0.05, one_sided=False):
+    """
+    Generate a DataFrame of exact (Clopper-Pearson) sample sizes over ps x ms.
+    """
+    p, m = (a.ravel() for a in np.meshgrid(ps, ms, indexing="ij"))
+    return pd.DataFrame({'p': p, 'm': m, 'n_required': n_required_exact(p, m, alpha, one_sided)})
+
+
+def _scalar_or_array(a):
+    a = np.asarray(a)
+    return a.item() if a.ndim == 0 else a
@@ -0,0 +1,251 @@
+"""Draw a stratified, sample-size-aware subset of transcripts to scan or hand-grade.
+
+The required n comes from the sample_calc formulas: enough transcripts for a (1-alpha) margin on the
+grader-corrected prevalence (n_required) and, by default, for a (1-alpha) chance of seeing at least one true
+positive (n_detect_one). That n is split across strata (benchmark, eval_label and pass/fail, where present in
+the load_eval_logs output) in proportion to their size, or computed per stratum with per_stratum=True.
+
+The sample is written as a transcript filter (one transcript_id per line) that tools/batch_scan.py reads with
+--transcripts-file; the same ids can go to scan_utils.load_scan_results(transcript_ids=...).
+
+    uv run python sample_size/sampler.py ../evals/swe_bench_verified/eval-logs \\
+        --prevalence 0.05 --margin 0.03 --sensitivity 0.9 -o sample.txt
+"""
+
+import argparse
+import logging
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from sample_calc import n_detect_one, n_required
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STRATA = ["benchmark", "eval_label", "transcript_success"]
+ANALYSIS_DIR = Path(__file__).resolve().parents[1] / "analysis"
+
+
+def required_n(
+    prevalence: float,
+    margin: float | None = 0.05,
+    sensitivity: float = 1.0,
+    specificity: float = 1.0,
+    alpha: float = 0.05,
+    population: int | None = None,
+    deff: float = 1.0,
+    detect_one: bool = True,
+) -> int:
+    """Transcripts needed to meet every requested target, capped at the population size.
+
+    Parameters
+    ----------
+    prevalence : float
+        Expected violation rate, 0 < prevalence < 1
+    margin : float or None
+        Target CI half-width for the corrected prevalence (see n_required); None skips this target
+    sensitivity, specificity : float
+        Grader/scanner Se and Sp assumed by the correction
+    alpha : float
+        1 - confidence for both targets
+    population : int or None
+        Number of transcripts sampled from (finite population correction, and the cap)
+    deff : float
+        Design effect multiplier (e.g. repeated epochs of the same task)
+    detect_one : bool
+        Also require a (1-alpha) probability of sampling at least one detected positive (see n_detect_one)
+
+    Returns
+    -------
+    int
+        Required sample size
+    """
+    if margin is None and not detect_one:
+        raise ValueError("Need a margin, detect_one, or both.")
+    n = 0.0
+    if margin is not None:
+        n = n_required(prevalence, sensitivity, specificity, m=margin, alpha=alpha, N=population, deff=deff)
+    if detect_one:
+        n = max(n, n_detect_one(prevalence, sensitivity, alpha=alpha))
+    if not math.isfinite(n):
+        raise ValueError("prevalence * sensitivity must be in (0, 1) to detect a positive.")
+    if population is not None:
+        n = min(n, population)
+    return int(n)
+
+
+def sample_plan(
+    logs: pd.DataFrame,
+    prevalence: float,
+    margin: float | None = 0.05,
+    sensitivity: float = 1.0,
+    specificity: float = 1.0,
+    alpha: float = 0.05,
+    deff: float = 1.0,
+    detect_one: bool = True,
+    strata: list[str] | None = None,
+    per_stratum: bool = False,
+    min_per_stratum: int = 1,
+) -> pd.DataFrame:
+    """Per-stratum population and sample sizes for :func:`stratified_sample`.
+
+    Parameters
+    ----------
+    logs : pd.DataFrame
+        load_eval_logs output (optionally several benchmarks concatenated with a ``benchmark`` column)
+    strata : list of str or None
+        Columns to stratify by; defaults to DEFAULT_STRATA, skipping any that logs lacks
+    per_stratum : bool
+        Size every stratum for the targets on its own (for per-stratum estimates) instead of splitting one
+        overall n proportionally
+    min_per_stratum : int
+        With proportional allocation, sample at least this many from every stratum (or all of it, if smaller)
+
+    The remaining parameters are passed to :func:`required_n`.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per stratum: the stratum columns, ``population``, ``n`` and ``sample_weight``
+        (population / n, the design weight of each sampled transcript)
+    """
+    strata = _strata_columns(logs, strata)
+    targets = dict(
+        prevalence=prevalence, margin=margin, sensitivity=sensitivity, specificity=specificity,
+        alpha=alpha, deff=deff, detect_one=detect_one,
+    )
+    if strata:
+        plan = logs.groupby(strata, dropna=False, sort=True).size().rename("population").reset_index()
+    else:
+        plan = pd.DataFrame({"population": [len(logs)]})
+    sizes = plan["population"].to_numpy()
+
+    if per_stratum:
+        plan["n"] = [required_n(population=int(size), **targets) for size in sizes]
+    else:
+        total = required_n(population=int(sizes.sum()), **targets)
+        plan["n"] = _allocate(sizes, total, min_per_stratum)
+    plan["sample_weight"] = plan["population"] / plan["n"].where(plan["n"] > 0)
+    return plan
+
+
+def stratified_sample(
+    logs: pd.DataFrame,
+    prevalence: float,
+    seed: int = 0,
+    **kwargs,
+) -> pd.DataFrame:
+    """Draw the transcripts planned by :func:`sample_plan`, uniformly at random within each stratum.
+
+    Keyword arguments are passed to :func:`sample_plan`. The draw is reproducible for a given seed and logs.
+
+    Returns
+    -------
+    pd.DataFrame
+        The sampled rows of logs, in their original order, with the stratum's ``sample_weight`` added
+    """
+    plan = sample_plan(logs, prevalence, **kwargs)
+    strata = [c for c in plan.columns if c not in ("population", "n", "sample_weight")]
+    rng = np.random.default_rng(seed)
+    keyed = logs.assign(_key=rng.random(len(logs)))
+    if strata:
+        keyed = keyed.merge(plan[[*strata, "n", "sample_weight"]], on=strata, how="left")
+        rank = keyed.groupby(strata, dropna=False, sort=False)["_key"].rank(method="first")
+    else:
+        keyed["n"], keyed["sample_weight"] = plan["n"].iloc[0], plan["sample_weight"].iloc[0]
+        rank = keyed["_key"].rank(method="first")
+    keep = (rank <= keyed["n"]).to_numpy()
+    sample = logs[keep].copy()
+    sample["sample_weight"] = keyed.loc[keep, "sample_weight"].to_numpy()
+    return sample
+
+
+def write_transcript_filter(sample: pd.DataFrame, path: str | Path, header: str | None = None) -> Path:
+    """Write sample's transcript ids one per line (``#`` lines are comments), as read by batch_scan --transcripts-file."""
+    path = Path(path)
+    lines = [f"# {line}" for line in (header or "").splitlines()]
+    lines.extend(sample["transcript_id"].astype(str))
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Internal helpers
+# ---------------------------------------------------------------------------
+
+
+def _strata_columns(logs: pd.DataFrame, strata: list[str] | None) -> list[str]:
+    if strata is None:
+        return [c for c in DEFAULT_STRATA if c in logs.columns]
+    missing = [c for c in strata if c not in logs.columns]
+    if missing:
+        raise KeyError(f"Strata columns not in logs: {missing}")
+    return list(strata)
+
+
+def _allocate(sizes: np.ndarray, n: int, min_per_stratum: int) -> np.ndarray:
+    """Split n across strata in proportion to sizes (largest remainder), never above a stratum's size."""
+    alloc = np.minimum(sizes, min_per_stratum)
+    remaining = min(n, int(sizes.sum())) - int(alloc.sum())
+    while remaining > 0:
+        room = sizes - alloc
+        share = remaining * np.where(room > 0, sizes, 0) / sizes[room > 0].sum()
+        add = np.minimum(np.floor(share).astype(int), room)
+        if not add.any():
+            # every share is < 1 here, so fewer than len(open strata) units are left: one each, largest first
+            order = np.argsort(-share, kind="stable")[:remaining]
+            add[order] = 1
+        alloc += add
+        remaining -= int(add.sum())
+    return alloc
+
+
+def main() -> None:
+    """Entry point."""
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    parser = argparse.ArgumentParser(description="Draw a stratified transcript sample sized for a prevalence target.")
+    parser.add_argument("eval_logs_dir", type=Path, help="Directory of .eval files (as for load_eval_logs)")
+    parser.add_argument("--prevalence", type=float, required=True, help="Expected violation rate")
+    parser.add_argument("--margin", type=float, default=0.05, help="Target CI half-width (0 to skip)")
+    parser.add_argument("--sensitivity", type=float, default=1.0, help="Assumed grader sensitivity")
+    parser.add_argument("--specificity", type=float, default=1.0, help="Assumed grader specificity")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--deff", type=float, default=1.0, help="Design effect")
+    parser.add_argument(
+        "--no-detect-one", action="store_true", help="Don't also require a positive to be detected with 1-alpha"
+    )
+    parser.add_argument("--strata", nargs="*", help=f"Columns to stratify by (default: {DEFAULT_STRATA})")
+    parser.add_argument("--per-stratum", action="store_true", help="Size each stratum for the targets on its own")
+    parser.add_argument("--label-segment", default="synth", help="Passed to load_eval_logs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=Path, default=Path("sample.txt"), help="Transcript filter to write")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ANALYSIS_DIR))
+    from scan_utils import load_eval_logs
+
+    logs = load_eval_logs(args.eval_logs_dir, label_segment=args.label_segment)
+    options = dict(
+        margin=args.margin or None,
+        sensitivity=args.sensitivity,
+        specificity=args.specificity,
+        alpha=args.alpha,
+        deff=args.deff,
+        detect_one=not args.no_detect_one,
+        strata=args.strata,
+        per_stratum=args.per_stratum,
+    )
+    plan = sample_plan(logs, args.prevalence, **options)
+    sample = stratified_sample(logs, args.prevalence, seed=args.seed, **options)
+    print(plan.to_string(index=False))
+    header = f"sampler: {args.eval_logs_dir} prevalence={args.prevalence} seed={args.seed} {options}"
+    write_transcript_filter(sample, args.output, header=header)
+    logger.info(f"Sampled {len(sample)} of {len(logs)} transcripts → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Monte Carlo check of grader-error-corrected prevalence estimates.
+
+sample_calc.n_required sizes a sample with the normal approximation and known Se/Sp. This simulates what actually
+happens: for each replicate, draw the true violations in a sample of n transcripts, the scanner's flags through
+its confusion matrix (Se, Sp), and -- when the correction uses Se/Sp estimated from a validation set of
+n_cal_pos positives and n_cal_neg negatives -- those estimates too. It then forms the corrected (Rogan-Gladen)
+estimate p = (q + Sp - 1) / (Se + Sp - 1) with a delta-method Wald interval and records coverage, interval
+width, bias and RMSE for every cell of a parameter grid.
+
+Replicates are drawn in chunks of at most max_elements values per array, so memory stays bounded however many
+replicates are asked for, and each chunk has its own child of the seed's SeedSequence, so results are
+identical whether the chunks run in this process or are sharded across workers.
+
+    from simulate import simulate_coverage
+    simulate_coverage([0.01, 0.05], se=[0.8, 0.95], sp=0.99, n=[200, 500], n_cal_pos=50, replicates=10**6)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+GRID_COLUMNS = ["prevalence", "sensitivity", "specificity", "n", "n_cal_pos", "n_cal_neg"]
+# Per-cell sums accumulated over chunks: defined estimates, covered intervals, width, error, squared error
+_SUMS = ["defined", "covered", "width", "error", "sq_error"]
+
+
+def simulate_coverage(
+    prevalence,
+    se,
+    sp=1.0,
+    n=100,
+    n_cal_pos=0,
+    n_cal_neg=0,
+    alpha=0.05,
+    concentration=None,
+    replicates=10_000,
+    seed=0,
+    workers=None,
+    max_elements=2**20,
+):
+    """
+    Coverage and precision of the corrected prevalence estimator over a grid of scenarios.
+
+    Parameters
+    ----------
+    prevalence, se, sp, n : float/int or list
+        True violation rate, scanner sensitivity and specificity, and transcripts sampled. Lists are crossed
+        (rows in nested-loop order, like sample_calc.grid_table).
+    n_cal_pos, n_cal_neg : int or list
+        Validation positives/negatives that Se and Sp are estimated from; 0 means Se (or Sp) is known exactly,
+        as n_required assumes.
+    alpha : float
+        1 - nominal coverage of the interval
+    concentration : float or None
+        If set, each replicate's true prevalence is drawn from Beta(prevalence * c, (1 - prevalence) * c)
+        (run-to-run variation in the violation rate) and coverage is judged against that draw.
+    replicates : int
+        Replicates per grid cell
+    seed : int
+        Seed for the root SeedSequence
+    workers : int or None
+        Run chunks on this many worker processes (None or 1 runs them in-process)
+    max_elements : int
+        Upper bound on the values per intermediate array (memory is a small multiple of 8 * max_elements bytes)
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per grid cell: the GRID_COLUMNS, ``coverage`` (share of intervals containing the true
+        prevalence), ``mean_width``, ``bias``, ``rmse`` and ``undefined`` (share of replicates where the
+        estimated Se + Sp <= 1, so no estimate exists; excluded from the other statistics)
+    """
+    grid = np.meshgrid(prevalence, se, sp, n, n_cal_pos, n_cal_neg, indexing="ij")
+    cells = {name: values.ravel() for name, values in zip(GRID_COLUMNS, grid)}
+    n_cells = len(cells["prevalence"])
+
+    reps_per_chunk = int(min(replicates, max_elements))
+    cells_per_block = max(1, max_elements // reps_per_chunk)
+    chunk_sizes = [reps_per_chunk] * (replicates // reps_per_chunk)
+    if replicates % reps_per_chunk:
+        chunk_sizes.append(replicates % reps_per_chunk)
+    blocks = [slice(start, start + cells_per_block) for start in range(0, n_cells, cells_per_block)]
+    seeds = np.random.SeedSequence(seed).spawn(len(blocks) * len(chunk_sizes))
+    tasks = [
+        (block, {name: values[block] for name, values in cells.items()}, reps, seeds[i], alpha, concentration)
+        for i, (block, reps) in enumerate((b, r) for b in blocks for r in chunk_sizes)
+    ]
+
+    sums = np.zeros((n_cells, len(_SUMS)))
+    if workers is not None and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_chunk, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+    else:
+        results = map(_simulate_chunk, tasks)
+    for (block, *_), chunk_sums in zip(tasks, results):
+        sums[block] += chunk_sums
+
+    defined, covered, width, error, sq_error = sums.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stats = {
+            "coverage": covered / defined,
+            "mean_width": width / defined,
+            "bias": error / defined,
+            "rmse": np.sqrt(sq_error / defined),
+            "undefined": 1 - defined / replicates,
+        }
+    return pd.DataFrame({**cells, **stats})
+
+
+def _simulate_chunk(task):
+    """Draw one chunk of replicates for a block of cells and return their per-cell sums (cells x _SUMS)."""
+    _, cells, reps, seed, alpha, concentration = task
+    rng = np.random.default_rng(seed)
+    shape = (len(cells["prevalence"]), reps)
+    col = {name: values[:, None] for name, values in cells.items()}
+
+    p = col["prevalence"]
+    if concentration is not None:
+        p = rng.beta(p * concentration, (1 - p) * concentration, size=shape)
+    n = col["n"]
+    positives = rng.binomial(n, p, size=shape)
+    flagged = rng.binomial(positives, col["sensitivity"]) + rng.binomial(n - positives, 1 - col["specificity"])
+    q = flagged / n
+
+    se_hat, se_var = _calibration(rng, col["sensitivity"], col["n_cal_pos"], shape)
+    sp_hat, sp_var = _calibration(rng, col["specificity"], col["n_cal_neg"], shape)
+    denom = se_hat + sp_hat - 1
+    defined = denom > 0
+    denom = np.where(defined, denom, 1.0)
+
+    estimate = np.clip((q + sp_hat - 1) / denom, 0, 1)
+    variance = (q * (1 - q) / n + estimate**2 * se_var + (1 - estimate) ** 2 * sp_var) / denom**2
+    half_width = norm.ppf(1 - alpha / 2) * np.sqrt(variance)
+    lower = np.clip(estimate - half_width, 0, 1)
+    upper = np.clip(estimate + half_width, 0, 1)
+
+    error = np.where(defined, estimate - p, 0.0)
+    return np.column_stack([
+        defined.sum(axis=1),
+        (defined & (lower <= p) & (p <= upper)).sum(axis=1),
+        np.where(defined, upper - lower, 0.0).sum(axis=1),
+        error.sum(axis=1),
+        (error**2).sum(axis=1),
+    ])
+
+
+def _calibration(rng, rate, n_cal, shape):
+    """Estimated rate and its sampling variance from n_cal validation cases (the true rate, variance 0, when n_cal is 0)."""
+    if not np.any(n_cal):
+        return np.broadcast_to(rate, shape), 0.0
+    size = np.maximum(n_cal, 1)
+    estimate = np.where(n_cal > 0, rng.binomial(size, rate, size=shape) / size, rate)
+    return estimate, np.where(n_cal > 0, estimate * (1 - estimate) / size, 0.0)
@@ -10,19 +10,37 @@ messages through to the scanner by placing them in the prompt directly.
 To run: from the evals directory run: scout scan scout.yaml
 
 can use scan_results_df("file_path_to_scan") to make a pandas dataframe from the scanner results
+
+LLM judge results are cached in .judge_cache.sqlite in the directory scout is run from (override with the
+SCOUT_JUDGE_CACHE environment variable, or pass cache=False to a scanner), so re-running a scan only pays for
+scanners whose prompts changed.
 """
 
+import ast
+import hashlib
+import json
+import logging
+import math
+import os
 import re
+import sqlite3
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from decimal import Decimal
+from functools import cached_property
 
 from pydantic import BaseModel, Field
 from shortuuid import uuid
 
 from inspect_scout import (
+    MessagesPreprocessor,
     Reference, 
     Result, 
     Scanner, 
     Transcript, 
     llm_scanner,
+    message_as_str,
     scanner, 
     tool_callers
 )
@@ -88,6 +106,561 @@ def get_gold_solution(transcript: Transcript) -> str:
     return "(not available)"
 
 
+def assistant_text(m, redacted_placeholder: str = "") -> str:
+    """Render an assistant message as its text and reasoning, omitting tool calls.
+
+    Redacted reasoning is replaced by its summary, or by redacted_placeholder if there is none.
+    """
+    if isinstance(m.content, str):
+        return m.content
+    parts = []
+    for c in m.content:
+        if c.type == "reasoning":
+            thinking = c.reasoning if not c.redacted else (c.summary or redacted_placeholder)
+            parts.append(f"reasoning trace:\n{thinking}\n [end of reasoning]")
+        elif c.type == "text":
+            parts.append(c.text)
+    return "\n".join(parts)
+
+
+## ----------- Shared transcript sections ---------
+# Several scanners render the same pieces of a transcript (system/user prompts, the last few assistant
+# messages, gold answers...). When scout runs them over the same transcript, TranscriptSections lets that
+# work happen once: every section is rendered on first access and then reused by the other scanners.
+
+SECTIONS_CACHE_SIZE = 64  # transcripts kept in the LRU below; each entry holds a reference to its transcript
+
+_sections_cache: OrderedDict[tuple, "TranscriptSections"] = OrderedDict()
+
+
+class MessageIndex:
+    """Message positions bucketed by role, built in one pass over the transcript.
+
+    Prompt builders read message positions from here instead of re-scanning transcript.messages for each role.
+    """
+
+    def __init__(self, messages: list) -> None:
+        self.by_role: dict[str, list[int]] = {"system": [], "user": [], "assistant": [], "tool": []}
+        for i, m in enumerate(messages):
+            self.by_role.setdefault(m.role, []).append(i)
+        self.final_idx = len(messages) - 1 if messages else None
+
+    def last_assistant(self, k: int) -> list[int]:
+        """Positions of the last k assistant messages before the final message."""
+        positions = self.by_role["assistant"]
+        end = len(positions)
+        if end and positions[-1] == self.final_idx:
+            end -= 1
+        return positions[max(0, end - k):end]
+
+
+class TranscriptSections:
+    """Lazily rendered prompt sections for one transcript. Use get_sections() rather than constructing directly."""
+
+    def __init__(self, transcript: Transcript) -> None:
+        self.transcript = transcript
+        self._preceding_text: dict[tuple, str] = {}
+
+    @cached_property
+    def index(self) -> MessageIndex:
+        return MessageIndex(self.transcript.messages)
+
+    @cached_property
+    def system_msgs(self) -> list[tuple[int, object]]:
+        return [(i, self.transcript.messages[i]) for i in self.index.by_role["system"]]
+
+    @cached_property
+    def user_msgs(self) -> list[tuple[int, object]]:
+        return [(i, self.transcript.messages[i]) for i in self.index.by_role["user"]]
+
+    @cached_property
+    def _system_texts(self) -> list[tuple[int, str]]:
+        return [(i, m.text) for i, m in self.system_msgs]
+
+    @cached_property
+    def _user_texts(self) -> list[tuple[int, str]]:
+        return [(i, m.text) for i, m in self.user_msgs]
+
+    @cached_property
+    def system_text(self) -> str:
+        return "\n".join(text for _, text in self._system_texts)
+
+    @cached_property
+    def user_text(self) -> str:
+        return "\n".join(text for _, text in self._user_texts)
+
+    @cached_property
+    def system_text_cited(self) -> str:
+        return "\n".join(f"[M{i}] {text}" for i, text in self._system_texts)
+
+    @cached_property
+    def user_text_cited(self) -> str:
+        return "\n".join(f"[M{i}] {text}" for i, text in self._user_texts)
+
+    @property
+    def final_idx(self) -> int | None:
+        return self.index.final_idx
+
+    @cached_property
+    def final_text(self) -> str:
+        if self.final_idx is None:
+            return "(no final message)"
+        return self.transcript.messages[self.final_idx].text
+
+    @cached_property
+    def final_text_cited(self) -> str:
+        if self.final_idx is None:
+            return "(no final message)"
+        return f"[M{self.final_idx}] {self.final_text}"
+
+    @cached_property
+    def gold_answers(self) -> str:
+        return get_gold_answers(self.transcript)
+
+    @cached_property
+    def gold_solution(self) -> str:
+        return get_gold_solution(self.transcript)
+
+    @cached_property
+    def task_result(self) -> str:
+        return "PASSED" if self.transcript.success else "FAILED"
+
+    @cached_property
+    def messages_digest(self) -> str:
+        """sha256 over the transcript's messages (ids excluded), used to key judge results for {{ messages }} templates."""
+        h = hashlib.sha256()
+        for m in self.transcript.messages:
+            if hasattr(m, "model_dump_json"):
+                h.update(m.model_dump_json(exclude={"id"}).encode())
+            else:
+                h.update(f"{m.role}\0{m.text}".encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def preceding_assistant(self, k: int) -> list[tuple[int, object]]:
+        """The last k assistant messages before the final message, as (index, message) pairs."""
+        return [(i, self.transcript.messages[i]) for i in self.index.last_assistant(k)]
+
+    def preceding_text(self, k: int, cite: bool = False, redacted_placeholder: str = "") -> str:
+        """The last k assistant messages before the final message, rendered with assistant_text()."""
+        key = (k, cite, redacted_placeholder)
+        if key not in self._preceding_text:
+            self._preceding_text[key] = "\n\n".join(
+                (f"[M{i}] " if cite else "") + assistant_text(m, redacted_placeholder)
+                for i, m in self.preceding_assistant(k)
+            ) or "(none)"
+        return self._preceding_text[key]
+
+
+def get_sections(transcript: Transcript) -> TranscriptSections:
+    """Return the shared TranscriptSections for a transcript, evicting the least recently used entry when full.
+
+    Keyed on transcript id and message count, so a filtered view of the same transcript gets its own entry.
+    """
+    key = (transcript.transcript_id, len(transcript.messages))
+    sections = _sections_cache.get(key)
+    if sections is None:
+        sections = TranscriptSections(transcript)
+        _sections_cache[key] = sections
+        if len(_sections_cache) > SECTIONS_CACHE_SIZE:
+            _sections_cache.popitem(last=False)
+    else:
+        _sections_cache.move_to_end(key)
+    return sections
+
+
+## ----------- Token budgeting ---------
+# The LLM scanners paste whole prompts, gold patches and (for the *_asst scanners and ground_truth_access) the full
+# transcript into the judge's context. On long SWE-bench / CORE-bench transcripts this blows up input tokens, so each
+# LLM scanner takes an optional token_budget. Sections are measured with a local tokenizer and the lowest-value content
+# is trimmed first. Messages are shortened but never removed, so [M#] citations still point at the right message.
+# Budgets are off unless set, since trimming changes what the judge sees; opt in per scanner in scout.yaml with
+# `params: {token_budget: ...}`. Each budgeted result carries metadata["token_budget"] with the per-section counts.
+
+# Suggested caps (tokens for the whole rendered prompt) for when a scanner's prompts outgrow the judge's context
+SUGGESTED_TOKEN_BUDGETS = {
+    "answer_format": 32_000,
+    "guessing": 32_000,
+    "ground_truth_access": 120_000,
+    "grading_guessing_asst": 120_000,
+    "grading_truth_asst": 120_000,
+}
+# Scanners that call a model (everything else is deterministic); tools/batch_scan.py schedules these separately
+LLM_SCANNERS = ["answer_format", "guessing", "ground_truth_access", "grading_guessing_asst", "grading_truth_asst"]
+QUESTION_TOKEN_SHARE = 0.25  # for {{ messages }} scanners, the share of the budget reserved for the question
+MIN_SECTION_TOKENS = 256  # a trimmed section never goes below this
+TOOL_OUTPUT_CAP = 2_000  # first pass: oversized middle tool outputs are cut to this
+TOOL_OUTPUT_FLOOR = 200  # second pass: remaining middle tool outputs are cut to this
+KEEP_RECENT_TOOL_OUTPUTS = 5  # the last N tool outputs (and the first one) are never trimmed
+
+# Sections in the order they are given up: an oversized gold diff first, the final submission last
+SECTION_TRIM_ORDER = ["gold_solution", "preceding", "user", "system", "gold_answers", "final"]
+
+logger = logging.getLogger(__name__)
+
+_encoding = None
+# The {"question": ..., "messages": [...]} token reports of the judge call in progress (set by cached_llm_scanner)
+_token_reports: ContextVar[dict | None] = ContextVar("token_reports", default=None)
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken's o200k_base encoding, or estimate at ~4 characters per token if unavailable."""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:  # not installed, or the encoding file can't be fetched offline
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def truncate_middle(text: str, max_tokens: int) -> str:
+    """Keep the head and tail of text within roughly max_tokens, replacing the middle with an omission marker."""
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    keep_chars = int(len(text) * max_tokens / tokens)
+    head = keep_chars * 2 // 3
+    tail = keep_chars - head
+    return f"{text[:head]}\n[... {tokens - max_tokens} tokens omitted ...]\n{text[len(text) - tail:] if tail else ''}"
+
+
+def trim_diff(text: str, max_tokens: int) -> str:
+    """Shorten a unified diff by capping the number of lines kept per hunk, keeping every file and hunk header."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    lines = text.split("\n")
+    for max_hunk_lines in (40, 20, 10, 5, 0):
+        kept, in_hunk, dropped = [], 0, 0
+        for line in lines:
+            if line.startswith(("diff --git", "--- ", "+++ ", "@@")) or not line.startswith((" ", "+", "-")):
+                if dropped:
+                    kept.append(f"[... {dropped} diff lines omitted ...]")
+                kept.append(line)
+                in_hunk, dropped = 0, 0
+            elif in_hunk < max_hunk_lines:
+                kept.append(line)
+                in_hunk += 1
+            else:
+                dropped += 1
+        if dropped:
+            kept.append(f"[... {dropped} diff lines omitted ...]")
+        trimmed = "\n".join(kept)
+        if count_tokens(trimmed) <= max_tokens:
+            return trimmed
+    return truncate_middle(trimmed, max_tokens)
+
+
+def fit_sections(sections: dict[str, str], budget: int, fixed_text: str = "") -> tuple[dict[str, str], dict]:
+    """Trim prompt sections (keyed by SECTION_TRIM_ORDER names) so they plus fixed_text fit in budget tokens.
+
+    Returns the trimmed sections and a report of {section: {"tokens": before, "kept": after}}.
+    """
+    counts = {name: count_tokens(text) for name, text in sections.items()}
+    excess = count_tokens(fixed_text) + sum(counts.values()) - budget
+    fitted = dict(sections)
+    kept = dict(counts)
+    for name in SECTION_TRIM_ORDER:
+        if excess <= 0:
+            break
+        if name not in fitted or counts[name] <= MIN_SECTION_TOKENS:
+            continue
+        target = max(MIN_SECTION_TOKENS, counts[name] - excess)
+        trim = trim_diff if name == "gold_solution" else truncate_middle
+        fitted[name] = trim(fitted[name], target)
+        kept[name] = count_tokens(fitted[name])
+        excess -= counts[name] - kept[name]
+    report = {name: {"tokens": counts[name], "kept": kept[name]} for name in sections}
+    return fitted, report
+
+
+def fit_messages(messages: list, budget: int) -> tuple[list, dict]:
+    """Shorten tool outputs so the transcript fits in budget tokens, without adding, removing or reordering messages.
+
+    In order: repeated tool outputs (e.g. the same file dumped twice) are replaced by a note, oversized middle tool
+    outputs are cut to TOOL_OUTPUT_CAP, then remaining middle tool outputs are cut to TOOL_OUTPUT_FLOOR, oldest first.
+    The first tool output and the last KEEP_RECENT_TOOL_OUTPUTS are left intact. Messages are counted as
+    llm_scanner renders them (role label, tool call names and arguments, tool errors), not just their text.
+    """
+    texts = [m.text for m in messages]
+    counts = [count_tokens(message_as_str(m) or "") for m in messages]
+    total = sum(counts)
+    report = {"messages": {"tokens": total, "kept": total}, "tool_outputs_trimmed": 0}
+    if total <= budget:
+        return messages, report
+
+    tool_positions = [i for i, m in enumerate(messages) if m.role == "tool"]
+    middle = tool_positions[1:-KEEP_RECENT_TOOL_OUTPUTS] if len(tool_positions) > KEEP_RECENT_TOOL_OUTPUTS + 1 else []
+    new_texts: dict[int, str] = {}
+
+    def replace(i: int, text: str) -> None:
+        nonlocal total
+        new_count = count_tokens(message_as_str(messages[i].model_copy(update={"content": text})) or "")
+        total -= counts[i] - new_count
+        counts[i] = new_count
+        new_texts[i] = text
+
+    seen: set[str] = set()
+    for i in middle:
+        if total <= budget:
+            break
+        if texts[i] in seen and counts[i] > TOOL_OUTPUT_FLOOR:
+            replace(i, "[repeated tool output omitted: identical to an earlier tool result]")
+        seen.add(texts[i])
+    for i in sorted(middle, key=lambda i: -counts[i]):
+        if total <= budget or counts[i] <= TOOL_OUTPUT_CAP:
+            break
+        replace(i, truncate_middle(new_texts.get(i, texts[i]), TOOL_OUTPUT_CAP))
+    for i in middle:
+        if total <= budget:
+            break
+        if counts[i] > TOOL_OUTPUT_FLOOR:
+            replace(i, truncate_middle(new_texts.get(i, texts[i]), TOOL_OUTPUT_FLOOR))
+
+    report["messages"]["kept"] = total
+    report["tool_outputs_trimmed"] = len(new_texts)
+    fitted = [
+        m.model_copy(update={"content": new_texts[i]}) if i in new_texts else m
+        for i, m in enumerate(messages)
+    ]
+    return fitted, report
+
+
+def budget_preprocessor(scanner_name: str, token_budget: int | None) -> MessagesPreprocessor | None:
+    """A MessagesPreprocessor that fits {{ messages }} into the non-question share of token_budget."""
+    if token_budget is None:
+        return None
+    messages_budget = int(token_budget * (1 - QUESTION_TOKEN_SHARE))
+
+    async def transform(messages: list) -> list:
+        fitted, report = fit_messages(messages, messages_budget)
+        logger.info("%s token budget (messages): %s", scanner_name, report)
+        _record_token_report("messages", report, per_segment=True)
+        return fitted
+
+    return MessagesPreprocessor(transform=transform)
+
+
+def budget_question(scanner_name: str, token_budget: int | None, prompt: str, sections: dict[str, str]) -> dict[str, str]:
+    """Fit a builder's sections into its budget (minus the prompt text) and report per-section token counts."""
+    if token_budget is None:
+        return sections
+    fitted, report = fit_sections(sections, token_budget, fixed_text=prompt)
+    logger.info("%s token budget (question): %s", scanner_name, report)
+    _record_token_report("question", report)
+    return fitted
+
+
+def _record_token_report(part: str, report: dict, per_segment: bool = False) -> None:
+    """Keep a budget report for the current judge call's result metadata (no-op outside cached_llm_scanner).
+
+    llm_scanner may split a long transcript into segments and preprocess each one, so per_segment reports are
+    collected in a list.
+    """
+    reports = _token_reports.get()
+    if reports is None:
+        return
+    if per_segment:
+        reports.setdefault(part, []).append(report)
+    else:
+        reports[part] = report
+
+
+## ----------- Judge cache ---------
+# Re-running `scout scan` after editing one scanner re-queries the model for every other LLM scanner, even though
+# their prompts are unchanged. cached_llm_scanner puts a local sqlite cache in front of llm_scanner, keyed by a hash
+# of everything that determines the judge's answer: model, generate config, template, answer type, rendered question
+# and (for {{ messages }} templates) the transcript messages plus the token budget used to trim them. The transcript
+# and message ids are part of the key too, since a cached Result's references point at them. Only results with a
+# parsed value are stored, so a judge reply that failed to parse is asked again next time.
+# Hits are returned without calling the model and are marked with metadata["judge_cache"] == "hit".
+
+JUDGE_CACHE_PATH = os.environ.get("SCOUT_JUDGE_CACHE", ".judge_cache.sqlite")  # relative to where scout is run
+JUDGE_CACHE_MAX_BYTES = 512 * 1024**2  # least recently used results are evicted beyond this
+JUDGE_CACHE_EVICT_TO = 0.9  # eviction frees space down to this fraction of the cap
+
+# Generate config fields that change how a request is sent, not what the model answers
+_TRANSPORT_CONFIG_FIELDS = {"max_connections", "max_retries", "timeout", "attempt_timeout", "max_tokens_per_minute"}
+
+_MESSAGES_TEMPLATE = re.compile(r"\{\{\s*messages\b")
+
+
+class JudgeCache:
+    """Content-addressed store of llm_scanner results in sqlite, with least-recently-used eviction by size.
+
+    Each row keeps the serialized Result (so hits round-trip references and metadata), plus the parsed value and the
+    judge's completion as plain columns for inspection.
+    """
+
+    def __init__(self, path: str = JUDGE_CACHE_PATH, max_bytes: int = JUDGE_CACHE_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: sqlite3.Connection | None = None
+        self._total_bytes = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS judge_results ("
+                "key TEXT PRIMARY KEY, scanner TEXT, model TEXT, value REAL, completion TEXT, result TEXT, "
+                "size INTEGER, created REAL, accessed REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS judge_results_accessed ON judge_results (accessed)")
+            self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM judge_results").fetchone()[0]
+        return self._conn
+
+    def get(self, key: str) -> Result | None:
+        row = self.conn.execute("SELECT result FROM judge_results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.conn.execute("UPDATE judge_results SET accessed = ? WHERE key = ?", (time.time(), key))
+        return Result.model_validate_json(row[0])
+
+    def put(self, key: str, scanner_name: str, model: str, result: Result) -> None:
+        payload = result.model_dump_json()
+        value = result.value if isinstance(result.value, (int, float)) and not isinstance(result.value, bool) else None
+        now = time.time()
+        # A re-run of the same judge call overwrites its row; only the size difference is added
+        replaced = self.conn.execute("SELECT size FROM judge_results WHERE key = ?", (key,)).fetchone()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO judge_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, scanner_name, model, value, result.explanation, payload, len(payload), now, now),
+        )
+        self._total_bytes += len(payload) - (replaced[0] if replaced else 0)
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used results until the cache is under JUDGE_CACHE_EVICT_TO of max_bytes."""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM judge_results").fetchone()[0]
+        excess = total - int(self.max_bytes * JUDGE_CACHE_EVICT_TO)
+        doomed = []
+        for key, size in self.conn.execute("SELECT key, size FROM judge_results ORDER BY accessed"):
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= size
+        self.conn.executemany("DELETE FROM judge_results WHERE key = ?", doomed)
+        self._total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM judge_results").fetchone()[0]
+
+
+_judge_cache: JudgeCache | None = None
+
+
+def get_judge_cache() -> JudgeCache:
+    """The process-wide JudgeCache at JUDGE_CACHE_PATH, opened on first use."""
+    global _judge_cache
+    if _judge_cache is None:
+        _judge_cache = JudgeCache()
+    return _judge_cache
+
+
+def _active_model() -> tuple[str, dict]:
+    """Name and answer-affecting generate config of the model llm_scanner will call."""
+    from inspect_ai.model import get_model
+
+    model = get_model()
+    config = model.config.model_dump(exclude_none=True) if getattr(model, "config", None) is not None else {}
+    return str(model), {k: v for k, v in config.items() if k not in _TRANSPORT_CONFIG_FIELDS}
+
+
+def judge_cache_key(
+    model: str, config: dict, template: str, answer: str, question: str, messages: str, extra: str, ids: list
+) -> str:
+    """sha256 over everything that determines a judge's answer (and its references) for one transcript."""
+    payload = json.dumps(
+        [model, config, template, answer, question, messages, extra, ids], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cached_llm_scanner(
+    scanner_name: str,
+    question,
+    template: str,
+    answer: str,
+    cache: bool = True,
+    cache_extra: str = "",
+    **kwargs,
+) -> Scanner[Transcript]:
+    """llm_scanner with results looked up in (and saved to) the judge cache.
+
+    cache_extra should hold anything else that changes what the judge sees, e.g. the token budget given to a
+    messages preprocessor. Token budget reports from the question and preprocessor go into
+    metadata["token_budget"]; cached results keep the report from the call that produced them.
+    """
+    if not cache:
+        uncached = llm_scanner(question=question, template=template, answer=answer, **kwargs)
+
+        async def scan_uncached(transcript: Transcript) -> Result:
+            reports: dict = {}
+            token = _token_reports.set(reports)
+            try:
+                return _with_token_reports(await uncached(transcript), reports)
+            finally:
+                _token_reports.reset(token)
+
+        return scan_uncached
+
+    # The question is rendered once for the cache key and handed to llm_scanner from here, rather than built twice
+    rendered: dict[str, str] = {}
+
+    async def rendered_question(transcript: Transcript) -> str:
+        q = rendered.pop(transcript.transcript_id, None)
+        return q if q is not None else await question(transcript)
+
+    inner = llm_scanner(question=rendered_question, template=template, answer=answer, **kwargs)
+    uses_messages = bool(_MESSAGES_TEMPLATE.search(template))
+
+    async def scan(transcript: Transcript) -> Result:
+        reports: dict = {}
+        token = _token_reports.set(reports)
+        try:
+            return await scan_cached(transcript, reports)
+        finally:
+            _token_reports.reset(token)
+
+    async def scan_cached(transcript: Transcript, reports: dict) -> Result:
+        q = await question(transcript)
+        model, config = _active_model()
+        messages = get_sections(transcript).messages_digest if uses_messages else ""
+        ids = [transcript.transcript_id, *(getattr(m, "id", None) for m in transcript.messages)]
+        key = judge_cache_key(model, config, template, str(answer), q, messages, cache_extra, ids)
+        judge_cache = get_judge_cache()
+
+        hit = judge_cache.get(key)
+        if hit is not None:
+            hit.metadata = {**(hit.metadata or {}), "judge_cache": "hit"}
+            return hit
+
+        rendered[transcript.transcript_id] = q
+        try:
+            result = await inner(transcript)
+        finally:
+            rendered.pop(transcript.transcript_id, None)
+        if isinstance(result, Result):
+            result = _with_token_reports(result, reports)
+            if result.value is not None:
+                judge_cache.put(key, scanner_name, model, result)
+            result.metadata = {**(result.metadata or {}), "judge_cache": "miss"}
+        return result
+
+    return scan
+
+
+def _with_token_reports(result, reports: dict):
+    """Add the judge call's token budget reports (if any were made) to its result's metadata."""
+    if reports and isinstance(result, Result):
+        result.metadata = {**(result.metadata or {}), "token_budget": dict(reports)}
+    return result
+
+
 ## ----------- Scanner implementations ---------
 
 # ---- Grading Scanner - Questions --------
@@ -102,25 +675,15 @@ def grading_answers() -> Scanner[Transcript]:
     
     async def scan(transcript: Transcript) -> Result:
 
-        system_text = "\n".join(
-            m.text for m in transcript.messages if m.role == "system"
-        )
-        user_text = "\n".join(
-            m.text for m in transcript.messages if m.role == "user"
-        )
-        final_msg = transcript.messages[-1] if transcript.messages else None
-        final_text = final_msg.text if final_msg else "(no final message)"
-        gold_answers = get_gold_answers(transcript)
-        gold_solution_code = get_gold_solution(transcript)
-        task_result = "PASSED" if transcript.success else "FAILED"
+        sections = get_sections(transcript)
 
         text_selection = (
-            f"--- SYSTEM PROMPT ---\n{system_text}\n\n"
-            f"--- USER PROMPT ---\n{user_text}\n\n"
-            f"--- FINAL SUBMISSION ---\n{final_text}\n\n"
-            f"--- GOLD SOLUTION CODE ---\n{gold_solution_code}\n\n"
-            f"--- GOLD STANDARD ANSWERS ---\n{gold_answers}\n\n"
-            f"--- TASK RESULT ---\n{task_result}\n"
+            f"--- SYSTEM PROMPT ---\n{sections.system_text}\n\n"
+            f"--- USER PROMPT ---\n{sections.user_text}\n\n"
+            f"--- FINAL SUBMISSION ---\n{sections.final_text}\n\n"
+            f"--- GOLD SOLUTION CODE ---\n{sections.gold_solution}\n\n"
+            f"--- GOLD STANDARD ANSWERS ---\n{sections.gold_answers}\n\n"
+            f"--- TASK RESULT ---\n{sections.task_result}\n"
         )
 
         return Result(value = True, explanation=text_selection)
@@ -139,48 +702,24 @@ def grading_guessing() -> Scanner[Transcript]:
     
     async def scan(transcript: Transcript) -> Result:
 
-        gold_answers = get_gold_answers(transcript)
-        task_result = "PASSED" if transcript.success else "FAILED"
-        system_text = "\n".join(
-            f"[M{i}] {m.text}" for i, m in enumerate(transcript.messages) if m.role == "system"
-        )
-        user_text = "\n".join(
-            f"[M{i}] {m.text}" for i, m in enumerate(transcript.messages) if m.role == "user"
-        )
-        final_idx = len(transcript.messages) - 1 if transcript.messages else None
-        final_msg = transcript.messages[final_idx] if final_idx is not None else None
-        final_text = f"[M{final_idx}] {final_msg.text}" if final_msg else "(no final message)"
+        sections = get_sections(transcript)
         # This intentionally omits tool calls, which can create very bloated transcripts, and just focuses on the model reasoning and messages. Also note sometimes the reasoning is redacted.
-        def assistant_text(m) -> str:
-            if isinstance(m.content, str):
-                return m.content
-            parts = []
-            for c in m.content:
-                if c.type == "reasoning":
-                    thinking = c.reasoning if not c.redacted else (c.summary or "REDACTED")
-                    parts.append(f"reasoning trace:\n{thinking}\n [end of reasoning]")
-                elif c.type == "text":
-                    parts.append(c.text)
-            return "\n".join(parts)
-
-        preceding_assistant = [(i, m) for i, m in enumerate(transcript.messages[:-1]) if m.role == "assistant"][-5:]
-        preceding_text = "\n\n".join(f"[M{i}] {assistant_text(m)}" for i, m in preceding_assistant) or "(none)"
+        preceding_text = sections.preceding_text(5, cite=True, redacted_placeholder="REDACTED")
 
         text_selection = (
-            f"--- SYSTEM PROMPT ---\n{system_text}\n\n"
-            f"--- USER PROMPT ---\n{user_text}\n\n"
+            f"--- SYSTEM PROMPT ---\n{sections.system_text_cited}\n\n"
+            f"--- USER PROMPT ---\n{sections.user_text_cited}\n\n"
             f"--- LAST 5 MESSAGES ---\n {preceding_text}\n\n"
-            f"--- FINAL SUBMISSION ---\n{final_text}\n\n"
-            f"--- GOLD STANDARD ANSWERS ---\n{gold_answers}\n\n"
-            f"--- TASK RESULT ---\n{task_result}\n"
+            f"--- FINAL SUBMISSION ---\n{sections.final_text_cited}\n\n"
+            f"--- GOLD STANDARD ANSWERS ---\n{sections.gold_answers}\n\n"
+            f"--- TASK RESULT ---\n{sections.task_result}\n"
         )
         # Note, I added this section to allow for message links. This might be overkill but I found it useful
-        system_msgs = [(i, m) for i, m in enumerate(transcript.messages) if m.role == "system"]
-        user_msgs = [(i, m) for i, m in enumerate(transcript.messages) if m.role == "user"]
-        final_msgs = [(final_idx, final_msg)] if final_msg else []
+        final_idx = sections.final_idx
+        final_msgs = [(final_idx, transcript.messages[final_idx])] if final_idx is not None else []
         refs = [
             Reference(type="message", cite=f"M{i}", id=m.id or uuid())
-            for i, m in system_msgs + user_msgs + preceding_assistant + final_msgs
+            for i, m in sections.system_msgs + sections.user_msgs + sections.preceding_assistant(5) + final_msgs
         ]
 
         return Result(value=True, explanation=text_selection, references=refs)
@@ -216,23 +755,34 @@ Option 3. The overall evaluation design is resistant to random guessing, conside
 """
 
 @scanner(messages="all")
-def grading_guessing_asst() -> Scanner[Transcript]:
+def grading_guessing_asst(
+    token_budget: int | None = None,
+    cache: bool = True,
+) -> Scanner[Transcript]:
+    question_budget = int(token_budget * QUESTION_TOKEN_SHARE) if token_budget else None
+
     async def build_question(transcript: Transcript) -> str:
 
-        gold_answers = get_gold_answers(transcript)
-        task_result = "PASSED" if transcript.success else "FAILED"
+        sections = get_sections(transcript)
+        parts = budget_question("grading_guessing_asst", question_budget, guessing_asst_prompt, {
+            "gold_answers": sections.gold_answers,
+        })
 
         return (
             f"{guessing_asst_prompt}"
-            f"--- GOLD STANDARD ANSWERS ---\n{gold_answers}\n"
-            f"--- TASK RESULT ---\n{task_result}\n"
+            f"--- GOLD STANDARD ANSWERS ---\n{parts['gold_answers']}\n"
+            f"--- TASK RESULT ---\n{sections.task_result}\n"
         )
     
     
-    return llm_scanner(
+    return cached_llm_scanner(
+        "grading_guessing_asst",
         question=build_question,
         answer="numeric",
         template=GUESSING_ASST_TEMPLATE,
+        cache=cache,
+        cache_extra=f"token_budget={token_budget}",
+        preprocessor=budget_preprocessor("grading_guessing_asst", token_budget),
     )
 
 # ---- Grading Scanner - Ground Truth Access -- LLM help --------
@@ -270,23 +820,34 @@ Your task is to identify messages in the transcript that may contain evidence th
 """
 
 @scanner(messages="all")
-def grading_truth_asst() -> Scanner[Transcript]:
+def grading_truth_asst(
+    token_budget: int | None = None,
+    cache: bool = True,
+) -> Scanner[Transcript]:
+    question_budget = int(token_budget * QUESTION_TOKEN_SHARE) if token_budget else None
+
     async def build_question(transcript: Transcript) -> str:
 
-        gold_answers = get_gold_answers(transcript)
-        task_result = "PASSED" if transcript.success else "FAILED"
+        sections = get_sections(transcript)
+        parts = budget_question("grading_truth_asst", question_budget, truth_asst_prompt, {
+            "gold_answers": sections.gold_answers,
+        })
 
         return (
             f"{truth_asst_prompt}"
-            f"--- GOLD STANDARD ANSWERS ---\n{gold_answers}\n"
-            f"--- TASK RESULT ---\n{task_result}\n"
+            f"--- GOLD STANDARD ANSWERS ---\n{parts['gold_answers']}\n"
+            f"--- TASK RESULT ---\n{sections.task_result}\n"
         )
     
     
-    return llm_scanner(
+    return cached_llm_scanner(
+        "grading_truth_asst",
         question=build_question,
         answer="numeric",
         template=TRUTH_ASST_TEMPLATE,
+        cache=cache,
+        cache_extra=f"token_budget={token_budget}",
+        preprocessor=budget_preprocessor("grading_truth_asst", token_budget),
     )
 
 # ----ground_truth_access----
@@ -327,26 +888,153 @@ Below is supplementary information on the expected answer, and gold-standard cod
 
 """
 
+# Optional deterministic pre-screen: most transcripts never go online, never touch solution-like files and never
+# see a gold value, so they can skip the judge. Each signal below adds its weight to a score; transcripts scoring
+# below prescreen_threshold are emitted with value PRESCREEN_SKIPPED instead of being judged.
+# Check recall against the T.5 validation CSVs with scan_utils.prescreen_recall before trusting a threshold.
+PRESCREEN_SKIPPED = -1
+PRESCREEN_WEIGHTS = {
+    "web_access": 1.0,  # a web search/browse tool, or curl/wget/URLs in tool call arguments
+    "git_history": 1.0,  # git log/show/reflog etc. can surface the upstream fix
+    "solution_path": 1.0,  # tool calls touching solution/gold/expected/ground-truth files
+    "gold_in_prompt": 1.0,  # a gold answer value or gold patch line appears in the system/user prompt
+    "gold_in_retrieved": 1.0,  # ... or in the output of a web, network or git history tool call
+    "gold_in_tool_output": 0.5,  # ... or in any other tool output (often just the agent's own computation)
+}
+
+WEB_TOOL_PATTERN = re.compile(r"web|search|brows|fetch|http", re.IGNORECASE)
+NETWORK_COMMAND_PATTERN = re.compile(r"\b(curl|wget|lynx|w3m)\b|https?://", re.IGNORECASE)
+GIT_HISTORY_PATTERN = re.compile(r"\bgit\s+(log|show|reflog|cat-file|fetch|pull|checkout\s+origin)\b")
+SOLUTION_PATH_PATTERN = re.compile(
+    r"[\w./-]*(solution|gold|ground[_-]?truth|expected|answers?)[\w-]*\.(py|json|csv|txt|md|patch|diff|sh|ya?ml)\b",
+    re.IGNORECASE,
+)
+# Gold values worth matching: decimals or 3+ digit integers, and long identifiers such as FAIL_TO_PASS test names
+GOLD_TOKEN_PATTERN = re.compile(r"(?<![\w.])-?\d+\.\d+(?![\w.])|(?<![\w.])\d{3,}(?![\w.])|\btest\w{6,}\b")
+MIN_PATCH_LINE_CHARS = 25  # shorter added lines (closing brackets, returns...) match too much code by chance
+
+
+def _gold_needles(transcript: Transcript) -> set[str]:
+    """Strings whose appearance in the agent's inputs suggests ground truth access.
+
+    Numeric values and test names from the gold answers (FAIL_TO_PASS only: PASS_TO_PASS tests already exist in the
+    repo) and sufficiently long added lines from the gold patch.
+    """
+    gold_answers = get_gold_answers(transcript).split("\n\nPASS_TO_PASS:")[0]
+    needles = set(GOLD_TOKEN_PATTERN.findall(gold_answers)) if gold_answers != "(not available)" else set()
+    for line in get_gold_solution(transcript).splitlines():
+        if line.startswith("+") and not line.startswith("+++"):
+            stripped = line[1:].strip()
+            if len(stripped) >= MIN_PATCH_LINE_CHARS:
+                needles.add(stripped)
+    return needles
+
+
+def prescreen_ground_truth(transcript: Transcript) -> tuple[float, dict[str, list[str]]]:
+    """Score a transcript for likely ground truth access with string heuristics only.
+
+    Returns the summed PRESCREEN_WEIGHTS of the signals that fired and, per fired signal, the message ids ("M12")
+    that triggered it.
+    """
+    sections = get_sections(transcript)
+    messages = transcript.messages
+    needles = _gold_needles(transcript)
+    callers = tool_callers(transcript)
+    fired: dict[str, list[str]] = {}
+
+    def fire(signal: str, idx: int) -> None:
+        fired.setdefault(signal, [])
+        if f"M{idx}" not in fired[signal]:
+            fired[signal].append(f"M{idx}")
+
+    def has_gold(text: str) -> bool:
+        return any(needle in text for needle in needles)
+
+    for i in sections.index.by_role["system"] + sections.index.by_role["user"]:
+        if needles and has_gold(messages[i].text):
+            fire("gold_in_prompt", i)
+
+    for i in sections.index.by_role["tool"]:
+        message = messages[i]
+        caller, caller_idx = callers.get(message.tool_call_id, (None, i)) if message.tool_call_id else (None, i)
+        call = next((tc for tc in (getattr(caller, "tool_calls", None) or []) if tc.id == message.tool_call_id), None)
+        function = getattr(call, "function", None) or message.function or ""
+        arguments = json.dumps(getattr(call, "arguments", None) or {}, default=str)
+
+        retrieved = False
+        if WEB_TOOL_PATTERN.search(function) or NETWORK_COMMAND_PATTERN.search(arguments):
+            fire("web_access", caller_idx)
+            retrieved = True
+        if GIT_HISTORY_PATTERN.search(arguments):
+            fire("git_history", caller_idx)
+            retrieved = True
+        if SOLUTION_PATH_PATTERN.search(arguments):
+            fire("solution_path", caller_idx)
+        if needles and has_gold(message.text):
+            fire("gold_in_retrieved" if retrieved else "gold_in_tool_output", i)
+
+    return float(sum(PRESCREEN_WEIGHTS[signal] for signal in fired)), fired
+
+
 @scanner(messages="all")
-def ground_truth_access() -> Scanner[Transcript]:
+def ground_truth_access(
+    token_budget: int | None = None,
+    cache: bool = True,
+    prescreen_threshold: float | None = None,
+) -> Scanner[Transcript]:
+    """Judge a transcript for ground truth access (T.5).
+
+    With prescreen_threshold set, transcripts whose prescreen_ground_truth() score is below it are not sent to the
+    judge and get value PRESCREEN_SKIPPED; judged results carry the pre-screen score in their metadata.
+    """
+    question_budget = int(token_budget * QUESTION_TOKEN_SHARE) if token_budget else None
+
     async def build_question(transcript: Transcript) -> str:
 
-        gold_answers = get_gold_answers(transcript)
-        task_result = "PASSED" if transcript.success else "FAILED"
-        gold_solution_code = get_gold_solution(transcript)
+        sections = get_sections(transcript)
+        parts = budget_question("ground_truth_access", question_budget, ground_truth_prompt, {
+            "gold_solution": sections.gold_solution,
+            "gold_answers": sections.gold_answers,
+        })
         return (
             f"{ground_truth_prompt}"
-            f"--- GOLD SOLUTION CODE ---\n{gold_solution_code}\n\n"
-            f"--- GOLD STANDARD ANSWERS ---\n{gold_answers}\n"
-            f"--- TASK RESULT ---\n{task_result}\n"
+            f"--- GOLD SOLUTION CODE ---\n{parts['gold_solution']}\n\n"
+            f"--- GOLD STANDARD ANSWERS ---\n{parts['gold_answers']}\n"
+            f"--- TASK RESULT ---\n{sections.task_result}\n"
         )
     
     
-    return llm_scanner(
+    judge = cached_llm_scanner(
+        "ground_truth_access",
         question=build_question,
         answer="numeric",
         template=TRUTH_TEMPLATE,
+        cache=cache,
+        cache_extra=f"token_budget={token_budget}",
+        preprocessor=budget_preprocessor("ground_truth_access", token_budget),
     )
+    if prescreen_threshold is None:
+        return judge
+
+    async def scan(transcript: Transcript) -> Result:
+        score, fired = prescreen_ground_truth(transcript)
+        prescreen = {"prescreen_score": score, "prescreen_signals": fired}
+        if score < prescreen_threshold:
+            return Result(
+                value=PRESCREEN_SKIPPED,
+                answer="skipped",
+                explanation=(
+                    f"Skipped by pre-screen (score {score} < {prescreen_threshold}); not sent to the LLM judge. "
+                    f"Signals: {fired or 'none'}"
+                ),
+                metadata=prescreen,
+            )
+        result = await judge(transcript)
+        if isinstance(result, Result):
+            result.metadata = {**(result.metadata or {}), **prescreen}
+        return result
+
+    return scan
 
 # ---- answer_format -----
 # check for correct specification of answer format that may lead to false negatives
@@ -387,52 +1075,40 @@ Score = 3, Impactful: Answer format ambiguity appears to have been a causal reas
 Do not include the label in your scores, just the numeric value.
 """
 @scanner(messages="all")
-def answer_format() -> Scanner[Transcript]:
+def answer_format(
+    token_budget: int | None = None,
+    cache: bool = True,
+) -> Scanner[Transcript]:
 
     async def build_question(transcript: Transcript) -> str:
-        system_text = "\n".join(
-            m.text for m in transcript.messages if m.role == "system"
-        )
-        user_text = "\n".join(
-            m.text for m in transcript.messages if m.role == "user"
-        )
-        final_msg = transcript.messages[-1] if transcript.messages else None
-        final_text = final_msg.text if final_msg else "(no final message)"
-        def assistant_text(m) -> str:
-            if isinstance(m.content, str):
-                return m.content
-            parts = []
-            for c in m.content:
-                if c.type == "reasoning":
-                    thinking = c.reasoning if not c.redacted else (c.summary or "")
-                    parts.append(f"reasoning trace:\n{thinking}\n [end of reasoning]")
-                elif c.type == "text":
-                    parts.append(c.text)
-            return "\n".join(parts)
-
-        preceding_assistant = [m for m in transcript.messages[:-1] if m.role == "assistant"][-4:]
-        preceding_text = "\n\n".join(assistant_text(m) for m in preceding_assistant) or "(none)"
-
-        gold_answers = get_gold_answers(transcript)
-        gold_solution_code = get_gold_solution(transcript)
-        task_result = "PASSED" if transcript.success else "FAILED"
+        sections = get_sections(transcript)
+        parts = budget_question("answer_format", token_budget, answer_format_prompt, {
+            "system": sections.system_text,
+            "user": sections.user_text,
+            "preceding": sections.preceding_text(4),
+            "final": sections.final_text,
+            "gold_solution": sections.gold_solution,
+            "gold_answers": sections.gold_answers,
+        })
 
         return (
             f"{answer_format_prompt}"
-            f"--- SYSTEM PROMPT ---\n{system_text}\n\n"
-            f"--- USER PROMPT ---\n{user_text}\n\n"
-            f"--- ASSISTANT MESSAGES (last 4 before submission) ---\n{preceding_text}\n\n"
-            f"--- FINAL SUBMISSION ---\n{final_text}\n\n"
-            f"--- GOLD SOLUTION CODE ---\n{gold_solution_code}\n\n"
-            f"--- GOLD STANDARD ANSWERS ---\n{gold_answers}\n"
-            f"--- TASK RESULT ---\n{task_result}\n" 
+            f"--- SYSTEM PROMPT ---\n{parts['system']}\n\n"
+            f"--- USER PROMPT ---\n{parts['user']}\n\n"
+            f"--- ASSISTANT MESSAGES (last 4 before submission) ---\n{parts['preceding']}\n\n"
+            f"--- FINAL SUBMISSION ---\n{parts['final']}\n\n"
+            f"--- GOLD SOLUTION CODE ---\n{parts['gold_solution']}\n\n"
+            f"--- GOLD STANDARD ANSWERS ---\n{parts['gold_answers']}\n"
+            f"--- TASK RESULT ---\n{sections.task_result}\n" 
 
         )
 
-    return llm_scanner(
+    return cached_llm_scanner(
+        "answer_format",
         question=build_question,
         answer="numeric",
         template=ANSWER_FORMAT_TEMPLATE,
+        cache=cache,
     )
 
 # ---- guessing -----
@@ -468,48 +1144,37 @@ Do not include the label in your scores, just the numeric value.
 """
 
 @scanner(messages="all")
-def guessing() -> Scanner[Transcript]:
+def guessing(
+    token_budget: int | None = None,
+    cache: bool = True,
+) -> Scanner[Transcript]:
 
     async def build_question(transcript: Transcript) -> str:
-        system_text = "\n".join(
-            m.text for m in transcript.messages if m.role == "system"
-        )
-        user_text = "\n".join(
-            m.text for m in transcript.messages if m.role == "user"
-        )
-        final_msg = transcript.messages[-1] if transcript.messages else None
-        final_text = final_msg.text if final_msg else "(no final message)"
-        def assistant_text(m) -> str:
-            if isinstance(m.content, str):
-                return m.content
-            parts = []
-            for c in m.content:
-                if c.type == "reasoning":
-                    thinking = c.reasoning if not c.redacted else (c.summary or "")
-                    parts.append(f"reasoning trace:\n{thinking}\n [end of reasoning]")
-                elif c.type == "text":
-                    parts.append(c.text)
-            return "\n".join(parts)
-
-        preceding_assistant = [m for m in transcript.messages[:-1] if m.role == "assistant"][-4:]
-        preceding_text = "\n\n".join(assistant_text(m) for m in preceding_assistant) or "(none)"
-        gold_answers = get_gold_answers(transcript)
-        task_result = "PASSED" if transcript.success else "FAILED"
+        sections = get_sections(transcript)
+        parts = budget_question("guessing", token_budget, guessing_prompt, {
+            "system": sections.system_text,
+            "user": sections.user_text,
+            "preceding": sections.preceding_text(4),
+            "final": sections.final_text,
+            "gold_answers": sections.gold_answers,
+        })
 
         return (
             f"{guessing_prompt}"
-            f"--- SYSTEM PROMPT ---\n{system_text}\n\n"
-            f"--- USER PROMPT ---\n{user_text}\n\n"
-            f"--- ASSISTANT MESSAGES (last 4 before submission) ---\n{preceding_text}\n\n"
-            f"--- FINAL SUBMISSION ---\n{final_text}\n\n"
-            f"--- GOLD STANDARD ANSWERS ---\n{gold_answers}\n"
-            f"--- TASK RESULT ---\n{task_result}\n"
+            f"--- SYSTEM PROMPT ---\n{parts['system']}\n\n"
+            f"--- USER PROMPT ---\n{parts['user']}\n\n"
+            f"--- ASSISTANT MESSAGES (last 4 before submission) ---\n{parts['preceding']}\n\n"
+            f"--- FINAL SUBMISSION ---\n{parts['final']}\n\n"
+            f"--- GOLD STANDARD ANSWERS ---\n{parts['gold_answers']}\n"
+            f"--- TASK RESULT ---\n{sections.task_result}\n"
         )
 
-    return llm_scanner(
+    return cached_llm_scanner(
+        "guessing",
         question=build_question,
         answer="numeric",
         template=GUESSING_TEMPLATE,
+        cache=cache,
     )
 
 # ---- Command_not_found -----
@@ -535,7 +1200,8 @@ def command_not_found() -> Scanner[Transcript]:
         pattern = r"(\w+): line \d+: (\w+): command not found"
 
         # Iterate through all tool messages with tool call ids
-        for message in (m for m in transcript.messages if m.role == "tool"):
+        tool_positions = get_sections(transcript).index.by_role["tool"]
+        for message in (transcript.messages[i] for i in tool_positions):
          
             # skip messages with no tool_call_id
             if message.tool_call_id is None:
@@ -580,3 +1246,447 @@ def command_not_found() -> Scanner[Transcript]:
         return results
 
     return scan
+
+# ---- tool_errors -----
+# Generalizes command_not_found to a catalog of tool failure signatures (T.2), reported with a category.
+# Each tool message is lowercased once and checked for every category's keywords with plain substring search;
+# a category's regex only runs on the few messages that contain one of its keywords. On ~20k tool messages this
+# is ~20x faster than a single compiled alternation of all signatures, which Python's re has to try at every offset.
+
+# (category, keywords, pattern). Keywords are lowercase substrings that every match of the pattern contains;
+# a <category>_detail group, when present, holds the command/module involved.
+TOOL_ERROR_CATALOG = [
+    ("command_not_found", ["command not found"],
+     r"(?:\S+: line \d+: )?(?P<command_not_found_detail>[\w.+-]+): command not found"),
+    ("module_not_found", ["no module named"],
+     r"(?:ModuleNotFoundError|ImportError): No module named '?(?P<module_not_found_detail>[\w.]+)"),
+    ("timeout", ["timed out", "timeouterror", "timeout expired", "deadline exceeded"],
+     r"(?i:timed out after \d+ seconds?|\bTimeoutError\b|timeout expired|command timed out|deadline exceeded)"),
+    ("permission_denied", ["permission denied", "operation not permitted", "eacces"],
+     r"(?i:permission denied|operation not permitted)|\bEACCES\b"),
+    ("oom_killed", ["out of memory", "cannot allocate memory", "oom", "memoryerror", "killed", " 137"],
+     r"(?i:out of memory|cannot allocate memory|oom-?killed)|\bMemoryError\b|^Killed$|exit (?:code|status) 137\b"),
+    ("sandbox_exit", ["sandbox", "container"],
+     r"(?i:\b(?:sandbox|container)\b[^\n]{0,80}?\b(?:exited|terminated|is not running|crashed|died)\b)"),
+]
+TOOL_ERROR_CATEGORIES = [category for category, _, _ in TOOL_ERROR_CATALOG]
+
+# inspect's ToolCallError.type values that map onto a catalog category
+TOOL_CALL_ERROR_TYPES = {"timeout": "timeout", "permission": "permission_denied"}
+
+
+def compile_tool_error_catalog(categories: list[str] | None = None) -> list[tuple[str, list[str], re.Pattern]]:
+    """The selected catalog entries with their patterns compiled."""
+    unknown = set(categories or []) - set(TOOL_ERROR_CATEGORIES)
+    if unknown:
+        raise ValueError(f"Unknown tool error categories {sorted(unknown)}; choose from {TOOL_ERROR_CATEGORIES}")
+    return [
+        (category, keywords, re.compile(pattern, re.MULTILINE))
+        for category, keywords, pattern in TOOL_ERROR_CATALOG
+        if categories is None or category in categories
+    ]
+
+
+def match_tool_errors(text: str, catalog: list[tuple[str, list[str], re.Pattern]]) -> dict[str, str]:
+    """Map each catalog category found in text to its detail (or matched text), first match per category."""
+    lowered = text.lower()
+    found: dict[str, str] = {}
+    for category, keywords, pattern in catalog:
+        if not any(keyword in lowered for keyword in keywords):
+            continue
+        match = pattern.search(text)
+        if match:
+            detail_group = f"{category}_detail"
+            found[category] = match.group(detail_group) if detail_group in pattern.groupindex else match.group(0)
+    return found
+
+
+class ToolError(BaseModel):
+    message_id: str = Field(description="Message that made the tool call.")
+    category: str = Field(description="Failure category from TOOL_ERROR_CATALOG.")
+    detail: str = Field(description="The command or module involved, or the matched text.")
+    tool: str | None = Field(description="Tool that produced the output.")
+
+
+@scanner(messages="all")
+def tool_errors(categories: list[str] | None = None) -> Scanner[Transcript]:
+    """Report tool failures (one result per tool message and category), optionally limited to some categories."""
+    catalog = compile_tool_error_catalog(categories)
+    wanted = {category for category, _, _ in catalog}
+
+    async def scan(transcript: Transcript) -> list[Result]:
+
+        results: list[Result] = []
+        tool_call_to_assistant = tool_callers(transcript)
+
+        tool_positions = get_sections(transcript).index.by_role["tool"]
+        for message in (transcript.messages[i] for i in tool_positions):
+            if message.tool_call_id is None:
+                continue
+
+            found = match_tool_errors(message.text, catalog)
+            # Failures inspect records on the message itself rather than in the output text
+            error = getattr(message, "error", None)
+            error_category = TOOL_CALL_ERROR_TYPES.get(getattr(error, "type", None))
+            if error_category in wanted and error_category not in found:
+                found[error_category] = error.message or error.type
+            if not found:
+                continue
+
+            assistant_msg, assistant_idx = tool_call_to_assistant.get(message.tool_call_id, (None, 0))
+            if assistant_msg is None:
+                continue
+
+            for category, detail in found.items():
+                results.append(
+                    Result(
+                        value=ToolError(
+                            message_id=f"M{assistant_idx}",
+                            category=category,
+                            detail=detail,
+                            tool=message.function,
+                        ).model_dump(),
+                        explanation=f"[M{assistant_idx}] {category} in {message.function} output: {detail}",
+                        references=[Reference(
+                            type="message",
+                            cite=f"M{assistant_idx}",
+                            id=assistant_msg.id or uuid()
+                        )],
+                    )
+                )
+
+        return results
+
+    return scan
+
+# ---- gold_leakage -----
+# A deterministic, LLM-free first pass for T.5: how much of the gold solution shows up in what the agent wrote or saw.
+# The gold is indexed once per transcript as a set of whitespace-token shingles (n-grams) over the added lines of the
+# SWE-bench patch, plus the set of CORE-bench result values; every assistant message (including tool call arguments,
+# where edits live) and tool output is then shingled and intersected with that index. System/user messages are
+# skipped so that gold injected into the prompt (inject_gold_patch / inject_gold_answers) only counts once the agent
+# uses it. Whitespace splitting rather than a regex tokenizer keeps this at tens of MB/s of transcript text.
+# Result values go through the same specificity rule as ground_truth_access's needles (GOLD_TOKEN_PATTERN): a gold
+# "2" or "A" turns up in "step 2" or a list label, so only decimals, 3+ digit integers and longer strings count.
+
+MIN_GOLD_VALUE_CHARS = 4  # shorter non-numeric result values ("A", "yes") match ordinary text by chance
+
+
+def _specific_value(value: str) -> bool:
+    """Whether a gold result value is specific enough that its appearance in a message suggests leakage."""
+    try:
+        float(value)
+    except ValueError:
+        return len(value.strip()) >= MIN_GOLD_VALUE_CHARS
+    return bool(GOLD_TOKEN_PATTERN.fullmatch(value.lstrip("+-")))
+
+
+def _result_values(results) -> set[str]:
+    """Leaf values of a CORE-bench results structure (list of {question: answer} dicts, possibly JSON-encoded)."""
+    if isinstance(results, str):
+        try:
+            results = json.loads(results)
+        except ValueError:
+            return {results} if results else set()
+    values: set[str] = set()
+    stack = [results]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif item is not None and not isinstance(item, bool):
+            values.add(str(item))
+    return values
+
+
+class GoldIndex:
+    """Shingles of the gold patch's added lines and the specific gold result values for one transcript."""
+
+    def __init__(self, sample_metadata: dict, n: int) -> None:
+        self.n = n
+        patch = sample_metadata.get("patch") or ""
+        added = "\n".join(
+            line[1:] for line in patch.splitlines() if line.startswith("+") and not line.startswith("+++")
+        )
+        self.ngrams = set(self._ngrams(added.split()))
+        self.values = {v for v in _result_values(sample_metadata.get("results")) if _specific_value(v)}
+        self._value_patterns = {v: re.compile(rf"(?<![\w.]){re.escape(v)}(?![\w]|\.\d)") for v in self.values}
+
+    def _ngrams(self, tokens: list[str]):
+        return zip(*(tokens[i:] for i in range(self.n)))
+
+    def __bool__(self) -> bool:
+        return bool(self.ngrams or self.values)
+
+    def overlap(self, text: str) -> tuple[float, float]:
+        """Share of gold patch shingles and of gold result values present in text."""
+        patch = len(self.ngrams.intersection(self._ngrams(text.split()))) / len(self.ngrams) if self.ngrams else 0.0
+        # substring test first; the boundary regex only runs on candidates
+        hits = sum(1 for v, pattern in self._value_patterns.items() if v in text and pattern.search(text))
+        values = hits / len(self.values) if self.values else 0.0
+        return patch, values
+
+
+def _argument_strings(arguments) -> list[str]:
+    """String leaves of a tool call's arguments, unescaped (json.dumps would turn newlines in edits into '\\n')."""
+    strings, stack = [], [arguments]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif item is not None:
+            strings.append(str(item))
+    return strings
+
+
+def _leakage_text(m) -> str:
+    """A message's text plus, for assistant messages, its tool call arguments (where file edits live)."""
+    parts = [m.text]
+    for tc in getattr(m, "tool_calls", None) or []:
+        parts.extend(_argument_strings(tc.arguments))
+    return "\n".join(parts)
+
+
+@scanner(messages="all")
+def gold_leakage(n: int = 5, report_threshold: float = 0.2) -> Scanner[Transcript]:
+    """Overlap between the gold patch/answers and each assistant and tool message.
+
+    value is the highest per-message overlap (0-1), or None when the transcript has no gold patch or results.
+    Messages at or above report_threshold are cited; per-message scores are in metadata.
+    """
+
+    async def scan(transcript: Transcript) -> Result:
+
+        sample_metadata = (transcript.metadata or {}).get("sample_metadata", {})
+        gold = GoldIndex(sample_metadata, n)
+        if not gold:
+            return Result(value=None, explanation="No gold patch or specific result values in sample metadata.")
+
+        index = get_sections(transcript).index
+        positions = sorted(index.by_role["assistant"] + index.by_role["tool"])
+        scores: dict[str, dict[str, float]] = {}
+        for i in positions:
+            patch, values = gold.overlap(_leakage_text(transcript.messages[i]))
+            if patch or values:
+                scores[f"M{i}"] = {"patch": round(patch, 4), "values": round(values, 4)}
+
+        top = max((max(s.values()) for s in scores.values()), default=0.0)
+        flagged = [(cite, s) for cite, s in scores.items() if max(s.values()) >= report_threshold]
+        if flagged:
+            explanation = "\n".join(
+                f"[{cite}] gold patch {n}-shingle overlap {s['patch']:.0%}, gold values {s['values']:.0%}"
+                for cite, s in flagged
+            )
+        else:
+            explanation = f"No message overlaps the gold patch or answers by {report_threshold:.0%} or more."
+
+        return Result(
+            value=top,
+            explanation=explanation,
+            references=[
+                Reference(type="message", cite=cite, id=transcript.messages[int(cite[1:])].id or uuid())
+                for cite, _ in flagged
+            ],
+            metadata={"message_scores": scores, "gold_ngrams": len(gold.ngrams), "gold_values": len(gold.values)},
+        )
+
+    return scan
+
+# ---- numeric_answers -----
+# Deterministic check for O.h.1 / O.b.3 on CORE-bench: compares the agent's report.json answers with the gold results
+# numerically and labels near misses (right number, wrong format) without a model call.
+# Gold results are a list of runs, each {question: value}. A numeric answer "matches" when it falls inside the 95%
+# prediction interval of the runs (as the CORE-bench scorer does), widened by rel_tol (none by default, so that a
+# single-run gold value must be hit exactly and a 91 against 91.3 counts as rounding); otherwise the answer is
+# re-tried under format transforms to classify the miss.
+
+ANSWER_CLASSES = ["match", "rounding", "scale", "unit", "string_match", "mismatch", "missing"]
+NEAR_MISS_CLASSES = {"rounding", "scale", "unit"}
+ANSWER_SCALES = [100, 0.01, 1000, 0.001]  # percent vs fraction, and k/milli unit slips
+NUMBER_PATTERN = re.compile(r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(%|[A-Za-z/°]{1,6})?\s*$")
+
+
+def _normalize_key(key: str) -> str:
+    return " ".join(str(key).lower().split()).rstrip(".:?")
+
+
+def _load_results(results) -> list[dict]:
+    """CORE-bench results as a list of {question: value} runs (metadata may hold it JSON-encoded)."""
+    if isinstance(results, str):
+        try:
+            results = json.loads(results)
+        except ValueError:
+            return []
+    if isinstance(results, dict):
+        results = [results]
+    return [run for run in results or [] if isinstance(run, dict)]
+
+
+def _parse_number(value) -> tuple[float | None, str | None, int | None]:
+    """(number, unit suffix, decimals shown) for numbers and numeric strings like '91.3%' or '12 ms'."""
+    if isinstance(value, bool):
+        return None, None, None
+    if isinstance(value, (int, float)):
+        return float(value), None, _decimal_places(repr(value)) if math.isfinite(value) else None
+    match = NUMBER_PATTERN.match(str(value).replace(",", ""))
+    if not match:
+        return None, None, None
+    number = match.group(1)
+    return float(number), match.group(2), _decimal_places(number)
+
+
+def _decimal_places(number: str) -> int:
+    """Decimal places a number is written to, counting the exponent ('1.5e-3' has 4, '2e-4' has 4, '1e5' has 0)."""
+    return max(0, -Decimal(number).as_tuple().exponent)
+
+
+def _gold_interval(values: list[float], rel_tol: float) -> tuple[float, float]:
+    """95% prediction interval over gold runs, padded by rel_tol of the mean (exact value when there is one run)."""
+    mean = sum(values) / len(values)
+    half = 0.0
+    if len(values) > 1:
+        from scipy.stats import t
+
+        sd = math.sqrt(sum((v - mean) ** 2 for v in values) / (len(values) - 1))
+        half = t.ppf(0.975, len(values) - 1) * sd * math.sqrt(1 + 1 / len(values))
+    pad = rel_tol * abs(mean) + 1e-12
+    return mean - half - pad, mean + half + pad
+
+
+def classify_answer(answer, gold_values: list, rel_tol: float = 0.0) -> str:
+    """Label one reported answer against the gold values of its question (one per run)."""
+    gold_numbers = [g for g in (_parse_number(v)[0] for v in gold_values) if g is not None]
+    if len(gold_numbers) < len(gold_values):
+        # Non-numeric gold: compare as normalized strings
+        gold_strings = {" ".join(str(v).lower().split()) for v in gold_values}
+        return "string_match" if " ".join(str(answer).lower().split()) in gold_strings else "mismatch"
+
+    number, unit, decimals = _parse_number(answer)
+    if number is None:
+        return "mismatch"
+    low, high = _gold_interval(gold_numbers, rel_tol)
+
+    def inside(x: float, lo: float = low, hi: float = high) -> bool:
+        return lo <= x <= hi
+
+    if inside(number):
+        return "unit" if unit and unit != "%" else "match"
+    if unit == "%" and inside(number / 100):
+        return "scale"  # percent reported for a fraction
+    # Rounded to fewer decimals than needed to land inside the interval
+    if decimals is not None:
+        step = 0.5 * 10 ** -decimals
+        if inside(number, low - step, high + step):
+            return "rounding"
+    for scale in ANSWER_SCALES:
+        if inside(number * scale):
+            return "scale"
+        if decimals is not None:
+            step = 0.5 * 10 ** -decimals * scale
+            if inside(number * scale, low - step, high + step):
+                return "scale"
+    return "mismatch"
+
+
+def _dict_candidates(text: str):
+    """Top-level {...} spans of text that parse as dicts (JSON, or Python literals as printed by the agent)."""
+    depth, start = 0, None
+    for i, ch in enumerate(text):
+        if ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                span = text[start:i + 1]
+                for parse in (json.loads, ast.literal_eval):
+                    try:
+                        parsed = parse(span)
+                    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                        continue
+                    if isinstance(parsed, dict):
+                        yield parsed
+                    break
+
+
+def extract_report(transcript: Transcript, gold_keys: set[str]) -> tuple[dict | None, int | None]:
+    """Answers from every dict in the transcript whose keys overlap the gold questions, and the last such message.
+
+    Looks at assistant text and tool call arguments (report.json writes) and tool outputs (cat report.json). Dicts are
+    merged in transcript order, so the last value reported for each question wins.
+    """
+    probes = [key[:40] for key in gold_keys]
+    found, found_idx = None, None
+    for i, m in enumerate(transcript.messages):
+        if m.role not in ("assistant", "tool"):
+            continue
+        texts = [m.text] + [s for tc in getattr(m, "tool_calls", None) or [] for s in _argument_strings(tc.arguments)]
+        for text in texts:
+            if "{" not in text:
+                continue
+            lowered = " ".join(text.lower().split())
+            if not any(probe in lowered for probe in probes):
+                continue
+            for candidate in _dict_candidates(text):
+                if gold_keys & {_normalize_key(k) for k in candidate}:
+                    found = {**(found or {}), **candidate}
+                    found_idx = i
+    return found, found_idx
+
+
+@scanner(messages="all")
+def numeric_answers(rel_tol: float = 0.0) -> Scanner[Transcript]:
+    """Classify each CORE-bench question's reported answer against the gold results.
+
+    value is the number of near misses (answers that only match after a rounding, scale or unit transform), or None
+    when the transcript has no CORE-bench results or no report could be extracted (so an unanswered transcript is
+    not read as one with no near misses). Per-question classes are in metadata.
+    """
+
+    async def scan(transcript: Transcript) -> Result:
+
+        sample_metadata = (transcript.metadata or {}).get("sample_metadata", {})
+        runs = _load_results(sample_metadata.get("results"))
+        if not runs:
+            return Result(value=None, explanation="No CORE-bench results in sample metadata.")
+
+        gold: dict[str, list] = {}
+        questions: dict[str, str] = {}
+        for run in runs:
+            for question, value in run.items():
+                key = _normalize_key(question)
+                questions.setdefault(key, question)
+                gold.setdefault(key, []).append(value)
+
+        report, report_idx = extract_report(transcript, set(gold))
+        reported = {_normalize_key(k): v for k, v in (report or {}).items()}
+        classes = {
+            questions[key]: classify_answer(reported[key], values, rel_tol) if key in reported else "missing"
+            for key, values in gold.items()
+        }
+        counts = {c: n for c in ANSWER_CLASSES if (n := sum(1 for v in classes.values() if v == c))}
+        near_misses = sum(counts.get(c, 0) for c in NEAR_MISS_CLASSES)
+
+        cite = f"[M{report_idx}] " if report_idx is not None else ""
+        explanation = "\n".join(
+            [f"{cite}Report answers vs gold: {counts}" if report is not None else "No report found in transcript."]
+            + [f"- {cls}: {question} (reported {reported.get(_normalize_key(question))!r}, gold {gold[_normalize_key(question)]!r})"
+               for question, cls in classes.items() if cls not in ("match", "string_match")]
+        )
+        references = []
+        if report_idx is not None:
+            references.append(Reference(type="message", cite=f"M{report_idx}", id=transcript.messages[report_idx].id or uuid()))
+
+        return Result(
+            value=near_misses if report is not None else None,
+            explanation=explanation,
+            references=references,
+            metadata={"classes": classes, "counts": counts},
+        )
+
+    return scan
@@ -0,0 +1,61 @@
+"""AdaptiveLimiter against tools/mock_model_server.py: 429s cut the limit, and it settles near capacity."""
+
+import asyncio
+import json
+import sys
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tools.adaptive_limiter import AdaptiveLimiter  # noqa: E402
+from tools.mock_model_server import MockModelState, serve  # noqa: E402
+
+CAPACITY = 4
+
+
+def _post(url: str) -> bool:
+    """Send one chat completion; True if it was rate limited."""
+    body = json.dumps({"model": "mock", "messages": [{"role": "user", "content": "score this"}]}).encode()
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            response.read()
+    except urllib.error.HTTPError as ex:
+        if ex.code == 429:
+            return True
+        raise
+    return False
+
+
+async def _run(url: str, limiter: AdaptiveLimiter, n_requests: int) -> list[float]:
+    loop = asyncio.get_running_loop()
+    limits = []
+    with ThreadPoolExecutor(max_workers=64) as pool:
+
+        async def one() -> None:
+            start = await limiter.acquire()
+            rate_limited = await loop.run_in_executor(pool, _post, url)
+            await limiter.release(start, rate_limited=rate_limited)
+            limits.append(limiter.limit)
+
+        await asyncio.gather(*(one() for _ in range(n_requests)))
+    return limits
+
+
+def test_limiter_cuts_on_429s_and_settles_near_capacity():
+    state = MockModelState(capacity=CAPACITY, rpm=None, tpm=None, latency=0.01)
+    server = serve("127.0.0.1", 0, state)
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    limiter = AdaptiveLimiter(initial=4 * CAPACITY, max_limit=8 * CAPACITY, latency_factor=None, log_interval=1e9)
+    try:
+        limits = asyncio.run(_run(url, limiter, 600))
+    finally:
+        server.shutdown()
+
+    assert limiter.rate_limited > 0 and state.rejected == limiter.rate_limited
+    assert min(limits) < CAPACITY  # the 429s from starting at 4x capacity cut the limit down past it
+    settled = limits[len(limits) // 2 :]
+    assert CAPACITY / 2 <= sum(settled) / len(settled) <= 1.5 * CAPACITY
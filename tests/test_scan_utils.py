@@ -0,0 +1,160 @@
+"""Equivalence checks for scan_utils against the straightforward pandas implementations it replaced."""
+
+import json
+import sqlite3
+import sys
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "analysis"))
+
+import scan_utils  # noqa: E402
+
+
+def _reference_load_scan_results(scan_results_dir: Path) -> pd.DataFrame:
+    """The original loader: concatenate every parquet file with pandas."""
+    frames = [
+        pd.read_parquet(pq_path)
+        for scan_dir in sorted(scan_results_dir.rglob("scan_id=*"))
+        for pq_path in sorted(scan_dir.glob("*.parquet"))
+    ]
+    combined = pd.concat(frames, ignore_index=True)
+    combined["value_num"] = pd.to_numeric(combined["value"], errors="coerce")
+    return combined
+
+
+def _reference_build_summary(logs: pd.DataFrame, scans: pd.DataFrame) -> pd.DataFrame:
+    """The original build_summary: groupby-first, pivot_table, then merge."""
+    agg = scans.groupby(["transcript_id", "scanner_key"]).agg(value=("value_num", "first")).reset_index()
+    pivot = agg.pivot_table(index="transcript_id", columns="scanner_key", values="value").reset_index()
+    pivot.columns.name = None
+    return logs.copy().merge(pivot, on="transcript_id", how="left")
+
+
+def _random_summary_inputs(rng: np.random.Generator) -> tuple[pd.DataFrame, pd.DataFrame]:
+    ids = [f"t{i}" for i in range(rng.integers(1, 40))]
+    logs = pd.DataFrame({"transcript_id": rng.choice([*ids, "unscanned"], rng.integers(1, 50)), "task_id": "x"})
+    logs["transcript_success"] = rng.random(len(logs)) < 0.5
+    if rng.random() < 0.3:
+        logs = logs.iloc[::2]  # non-range index
+    keys = ["answer_format", "guessing", "grading_answers"]
+    if rng.random() < 0.2:
+        keys.append("task_id")  # collides with a logs column: merge suffixes
+    n = rng.integers(0, 200)
+    scans = pd.DataFrame({
+        "transcript_id": rng.choice([*ids, None], n),
+        "scanner_key": rng.choice([*keys, None], n),
+        "value": rng.choice(["0", "1", "2", "x", None], n),
+    })
+    scans["value_num"] = pd.to_numeric(scans["value"], errors="coerce")
+    return logs, scans
+
+
+def _sorted(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame.sort_values(["scanner_key", "transcript_id"]).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("index", [False, True])
+def test_load_scan_results_mixed_value_types(tmp_path, index):
+    scan_dir = tmp_path / "scan_id=a"
+    scan_dir.mkdir()
+    ids = ["t1", "t2", "t3"]
+    pd.DataFrame({"transcript_id": ids, "scanner_key": "grading_answers", "value": [True, False, True]}).to_parquet(
+        scan_dir / "grading.parquet"
+    )
+    pd.DataFrame({"transcript_id": ids, "scanner_key": "judge", "value": ['{"a": 1}', "2", "x"]}).to_parquet(
+        scan_dir / "judge.parquet"
+    )
+    pd.DataFrame({"transcript_id": ids, "scanner_key": "count", "value": [3, 0, 1]}).to_parquet(
+        scan_dir / "count.parquet"
+    )
+
+    expected = _sorted(_reference_load_scan_results(tmp_path))
+    actual = _sorted(scan_utils.load_scan_results(tmp_path, index=index))
+    pd.testing.assert_series_equal(actual["value_num"], expected["value_num"])
+
+    logs = pd.DataFrame({"transcript_id": ids, "task_id": "x", "transcript_success": True})
+    summary = scan_utils.build_summary(logs, actual)
+    assert summary["grading_answers"].tolist() == [1.0, 0.0, 1.0]
+    assert summary["count"].tolist() == [3.0, 0.0, 1.0]
+
+
+def test_load_scan_results_drops_superseded_fragments_next_to_unfragmented_rows(tmp_path):
+    scan_dir = tmp_path / "scan_id=a"
+    scan_dir.mkdir()
+    pd.DataFrame({"scan_id": "a", "transcript_id": ["t1"], "scanner_key": "scout", "value": [1.0]}).to_parquet(
+        scan_dir / "scout.parquet"
+    )
+    for fragment, value in enumerate([3.0, 0.0]):
+        pd.DataFrame(
+            {"scan_id": "a", "transcript_id": ["t1"], "scanner_key": "judge", "value": [value], "fragment": [fragment]}
+        ).to_parquet(scan_dir / f"judge.{fragment:05d}.parquet")
+
+    loaded = _sorted(scan_utils.load_scan_results(tmp_path))
+    assert loaded[["scanner_key", "transcript_id", "value_num"]].values.tolist() == [
+        ["judge", "t1", 0.0],
+        ["scout", "t1", 1.0],
+    ]
+
+
+def test_load_validations_reads_bom_and_empty_targets_like_pandas(tmp_path):
+    (tmp_path / "swe_bench_bom.csv").write_bytes(b"\xef\xbb\xbfid,target,notes\na,1,x\nb,,y\nc,0,\n")
+    (tmp_path / "swe_bench_labels.csv").write_text("id,target\na,pass\nb,\nc,fail\n")
+
+    validations = scan_utils.load_validations(tmp_path)
+    for column in ("bom", "labels"):
+        expected = pd.read_csv(tmp_path / f"swe_bench_{column}.csv")["target"]
+        assert validations[column].isna().tolist() == expected.isna().tolist()
+    assert validations["bom"].tolist()[::2] == [1.0, 0.0]
+    assert validations["labels"].tolist()[::2] == ["pass", "fail"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_build_summary_matches_groupby_pivot_merge(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(50):
+        logs, scans = _random_summary_inputs(rng)
+        pd.testing.assert_frame_equal(scan_utils.build_summary(logs, scans), _reference_build_summary(logs, scans))
+
+
+@pytest.mark.parametrize("value_num", [[], [np.nan, np.nan]], ids=["no_rows", "no_values"])
+def test_build_summary_without_scanner_values_returns_logs(value_num):
+    logs = pd.DataFrame({"transcript_id": ["t1", "t2"], "task_id": "x", "transcript_success": [True, False]})
+    scans = pd.DataFrame({
+        "transcript_id": pd.Series(["t1", "t2"][: len(value_num)], dtype=object),
+        "scanner_key": pd.Series(["judge"] * len(value_num), dtype=object),
+        "value_num": pd.Series(value_num, dtype=float),
+    })
+    summary = scan_utils.build_summary(logs, scans)
+    pd.testing.assert_frame_equal(summary, logs)
+    pd.testing.assert_frame_equal(summary, _reference_build_summary(logs, scans))
+
+
+def _write_eval(path: Path, ids: list[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    summaries = [{"uuid": i, "id": i, "scores": {"scorer": {"value": "C"}}} for i in ids]
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("summaries.json", json.dumps(summaries))
+
+
+def test_load_eval_logs_cache_is_opt_in_and_drops_deleted_archives(tmp_path):
+    _write_eval(tmp_path / "a" / "one.eval", ["t1", "t2"])
+    _write_eval(tmp_path / "a" / "two.eval", ["t3"])
+    cache_path = tmp_path / scan_utils.EVAL_CACHE_NAME
+
+    scan_utils.load_eval_logs(tmp_path)
+    assert not cache_path.exists()
+
+    first = scan_utils.load_eval_logs(tmp_path, cache=True)
+    assert first["transcript_id"].tolist() == ["t1", "t2", "t3"]
+    (tmp_path / "a" / "two.eval").unlink()
+    _write_eval(tmp_path / "a" / "one.eval", ["t4"])
+    assert scan_utils.load_eval_logs(tmp_path, cache=True)["transcript_id"].tolist() == ["t4"]
+
+    with sqlite3.connect(cache_path) as conn:
+        assert conn.execute("SELECT path, transcript_id FROM samples").fetchall() == [("a/one.eval", "t4")]
+        assert conn.execute("SELECT path FROM files").fetchall() == [("a/one.eval",)]
@@ -0,0 +1,167 @@
+"""Unit tests for the deterministic helpers in scanners.py."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("inspect_scout")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import scanners  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    ("answer", "gold", "expected"),
+    [
+        (91.3, [91.3], "match"),
+        ("91.30", [91.3], "match"),
+        (0.1 + 0.2, [0.3], "match"),
+        (91, [91.3], "rounding"),
+        ("91.3", [91.34], "rounding"),
+        ("2e-4", [0.00024], "rounding"),
+        ("91.3%", [0.913], "scale"),
+        (91.3, [0.913], "scale"),
+        ("913 ms", [0.913], "scale"),
+        ("12 ms", [12], "unit"),
+        (92, [91.3], "mismatch"),
+        ("x", [91.3], "mismatch"),
+        ("Adam", ["adam"], "string_match"),
+        ("SGD", ["adam"], "mismatch"),
+    ],
+)
+def test_classify_answer(answer, gold, expected):
+    assert scanners.classify_answer(answer, gold) == expected
+
+
+@pytest.mark.parametrize(
+    ("answer", "gold"),
+    [("2e-4", [0.03]), (1e-05, [0.2]), ("1.5e-3", [0.04]), ("0.0002", [0.03])],
+)
+def test_classify_answer_counts_exponent_in_rounding_step(answer, gold):
+    assert scanners.classify_answer(answer, gold) == "mismatch"
+
+
+@pytest.mark.parametrize(
+    ("text", "decimals"),
+    [("91.3", 1), ("91", 0), ("2e-4", 4), ("1.5e-3", 4), ("1.5E+3", 0), ("1e-05", 5), ("0.00", 2)],
+)
+def test_decimal_places(text, decimals):
+    assert scanners._decimal_places(text) == decimals
+
+
+def test_classify_answer_uses_prediction_interval_over_runs():
+    gold = [10.0, 10.2, 9.8, 10.1]
+    assert scanners.classify_answer(10.5, gold) == "match"
+    assert scanners.classify_answer(12, gold) == "mismatch"
+
+
+def _diff(n_files: int, hunks: int, lines: int) -> str:
+    parts = []
+    for f in range(n_files):
+        parts += [f"diff --git a/f{f}.py b/f{f}.py", f"--- a/f{f}.py", f"+++ b/f{f}.py"]
+        for h in range(hunks):
+            parts.append(f"@@ -{h * 100},{lines} +{h * 100},{lines} @@")
+            parts += [f"+added line {i} of hunk {h} in file {f}" for i in range(lines)]
+    return "\n".join(parts)
+
+
+def test_truncate_middle_keeps_head_and_tail():
+    text = "".join(f"line {i}\n" for i in range(2000))
+    assert scanners.truncate_middle(text, 10_000) == text
+    short = scanners.truncate_middle(text, 200)
+    assert short.startswith("line 0\n") and short.endswith("line 1999\n")
+    assert "tokens omitted" in short
+    assert scanners.count_tokens(short) <= 200 + 20
+
+
+def test_trim_diff_keeps_every_file_and_hunk_header():
+    diff = _diff(n_files=3, hunks=4, lines=100)
+    assert scanners.trim_diff(diff, 10**6) == diff
+    trimmed = scanners.trim_diff(diff, 1_500)
+    headers = [line for line in diff.split("\n") if line.startswith(("diff --git", "@@"))]
+    assert [line for line in trimmed.split("\n") if line.startswith(("diff --git", "@@"))] == headers
+    assert "diff lines omitted" in trimmed
+    assert scanners.count_tokens(trimmed) <= 1_500
+
+
+def test_fit_sections_trims_in_order_and_reports_counts():
+    sections = {"final": "answer " * 500, "gold_solution": _diff(2, 3, 200), "user": "task " * 500}
+    counts = {name: scanners.count_tokens(text) for name, text in sections.items()}
+    budget = counts["final"] + counts["user"] + 1_000
+
+    fitted, report = scanners.fit_sections(sections, budget)
+    assert fitted["final"] == sections["final"] and fitted["user"] == sections["user"]
+    assert fitted["gold_solution"] != sections["gold_solution"]
+    assert report["gold_solution"]["tokens"] == counts["gold_solution"]
+    assert sum(entry["kept"] for entry in report.values()) <= budget
+
+    untouched, report = scanners.fit_sections(sections, 10**6)
+    assert untouched == sections
+    assert all(entry["tokens"] == entry["kept"] for entry in report.values())
+
+
+def _tool_transcript(outputs: list[str]) -> list:
+    from inspect_ai.model import ChatMessageAssistant, ChatMessageTool, ChatMessageUser
+    from inspect_ai.tool import ToolCall
+
+    messages = [ChatMessageUser(content="Fix the bug.")]
+    for i, output in enumerate(outputs):
+        call = ToolCall(id=f"c{i}", function="bash", arguments={"cmd": f"step {i}"})
+        messages.append(ChatMessageAssistant(content="", tool_calls=[call]))
+        messages.append(ChatMessageTool(content=output, tool_call_id=f"c{i}", function="bash"))
+    messages.append(ChatMessageAssistant(content="Done."))
+    return messages
+
+
+def test_fit_messages_shortens_middle_tool_outputs_only():
+    # The first and last five tool outputs are kept whole; the six in between are large
+    outputs = [f"output {i} " * (3_000 if 1 <= i <= 6 else 50) for i in range(12)]
+    outputs[4] = outputs[3]  # the same file dumped twice
+    messages = _tool_transcript(outputs)
+    total = sum(scanners.count_tokens(scanners.message_as_str(m)) for m in messages)
+
+    fitted, report = scanners.fit_messages(messages, total // 3)
+    assert [(m.role, m.id) for m in fitted] == [(m.role, m.id) for m in messages]
+    tool_texts = [m.text for m in fitted if m.role == "tool"]
+    assert tool_texts[0] == outputs[0] and tool_texts[-5:] == outputs[-5:]
+    assert "repeated tool output omitted" in tool_texts[4]
+    assert report["messages"] == {"tokens": total, "kept": report["messages"]["kept"]}
+    assert report["messages"]["kept"] <= total // 3
+    assert report["tool_outputs_trimmed"] == sum(a.text != b.text for a, b in zip(fitted, messages))
+
+
+def test_fit_messages_counts_tool_call_arguments():
+    from inspect_ai.model import ChatMessageAssistant
+    from inspect_ai.tool import ToolCall
+
+    edit = ToolCall(id="c0", function="write_file", arguments={"path": "a.py", "content": "x = 1\n" * 2_000})
+    messages = [ChatMessageAssistant(content="", tool_calls=[edit])]
+    _, report = scanners.fit_messages(messages, 10**6)
+    assert report["messages"]["tokens"] >= scanners.count_tokens(edit.arguments["content"])
+
+
+def test_token_budget_reports_go_into_result_metadata():
+    reports: dict = {}
+    token = scanners._token_reports.set(reports)
+    try:
+        fitted = scanners.budget_question("answer_format", 300, "prompt", {"final": "answer " * 2_000})
+        scanners._record_token_report("messages", {"messages": {"tokens": 5, "kept": 5}}, per_segment=True)
+    finally:
+        scanners._token_reports.reset(token)
+
+    result = scanners._with_token_reports(scanners.Result(value=1), reports)
+    assert result.metadata["token_budget"]["question"]["final"]["kept"] == scanners.count_tokens(fitted["final"])
+    assert result.metadata["token_budget"]["messages"] == [{"messages": {"tokens": 5, "kept": 5}}]
+    assert scanners._with_token_reports(scanners.Result(value=1), {}).metadata is None
+
+
+def test_judge_cache_byte_total_counts_replaced_rows_once(tmp_path):
+    cache = scanners.JudgeCache(str(tmp_path / "judge.sqlite"))
+    for explanation in ("short", "a much longer explanation", "mid length"):
+        cache.put("same-key", "guessing", "mock", scanners.Result(value=1, explanation=explanation))
+    cache.put("other-key", "guessing", "mock", scanners.Result(value=0))
+
+    stored = cache.conn.execute("SELECT SUM(size) FROM judge_results").fetchone()[0]
+    assert cache._total_bytes == stored
+    assert cache.get("same-key").explanation == "mid length"
@@ -0,0 +1,194 @@
+"""AIMD concurrency limiter for LLM scanner calls.
+
+Fixed `max_connections` values either trip provider rate limits or leave throughput unused. AdaptiveLimiter
+tunes the number of concurrent requests live: additive increase (about +1 slot per window of successful
+requests), multiplicative decrease on rate-limit errors, and a gentler decrease when latency climbs well above
+its recent baseline (queueing at the provider usually shows up before the 429s do). Latency is compared per
+token of request, so a run of large prompts doesn't read as congestion, and the baseline is the lowest smoothed
+latency seen, drifting slowly up toward the current level so that one lucky stretch of fast responses can't
+hold the limit down for the rest of the run. Requests-per-minute and tokens-per-minute ceilings are enforced
+over a sliding 60s window on top of the concurrency limit.
+
+Used by tools/batch_scan.py; try it against tools/mock_model_server.py, which injects 429s.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60.0
+LATENCY_EWMA_ALPHA = 0.2
+LATENCY_DECREASE = 0.9  # multiplicative decrease when latency (not a 429) signals congestion
+LATENCY_FLOOR_DECAY = 0.03  # per window (limit) of responses, the latency baseline moves this share up to the EWMA
+LATENCY_BASE_TOKENS = 1000  # fixed per-request overhead, in tokens, when scaling latency by request size
+
+
+def is_rate_limit_error(ex: BaseException) -> bool:
+    """True if ex (or anything in its cause/context chain) is an HTTP 429 or a provider rate-limit error."""
+    seen = set()
+    while ex is not None and id(ex) not in seen:
+        seen.add(id(ex))
+        status = getattr(ex, "status_code", None) or getattr(getattr(ex, "response", None), "status_code", None)
+        if status == 429 or "ratelimit" in type(ex).__name__.lower() or "rate limit" in str(ex).lower():
+            return True
+        ex = ex.__cause__ or ex.__context__
+    return False
+
+
+def is_transient_error(ex: BaseException) -> bool:
+    """True if ex (or its cause/context chain) is a 5xx, 408, timeout or dropped connection worth retrying."""
+    seen = set()
+    while ex is not None and id(ex) not in seen:
+        seen.add(id(ex))
+        status = getattr(ex, "status_code", None) or getattr(getattr(ex, "response", None), "status_code", None)
+        name = type(ex).__name__.lower()
+        if isinstance(status, int) and (status >= 500 or status == 408):
+            return True
+        if isinstance(ex, (TimeoutError, ConnectionError)) or "timeout" in name or "connection" in name:
+            return True
+        ex = ex.__cause__ or ex.__context__
+    return False
+
+
+class AdaptiveLimiter:
+    """Concurrency limit tuned by AIMD, with optional requests/tokens-per-minute ceilings.
+
+    Call ``start = await acquire(tokens)`` before a request and
+    ``await release(start, rate_limited=..., tokens=tokens)`` after it. With adaptive=False the limit stays at
+    initial and only the per-minute ceilings apply.
+    """
+
+    def __init__(
+        self,
+        initial: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        adaptive: bool = True,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_factor: float | None = 3.0,
+        log_interval: float = 30.0,
+    ) -> None:
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.adaptive = adaptive
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.log_interval = log_interval
+
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+        self._window: deque[tuple[float, int]] = deque()  # (start time, tokens) of requests in the last minute
+        self._window_tokens = 0
+        self._last_decrease = 0.0
+        self._latency_ewma: float | None = None
+        self._latency_floor: float | None = None
+
+        self._began = time.monotonic()
+        self._last_log = self._began
+        self.completed = 0
+        self.rate_limited = 0
+        self.tokens = 0
+        self.peak_limit = self.limit
+
+    def _prune(self, now: float) -> None:
+        while self._window and self._window[0][0] <= now - WINDOW_SECONDS:
+            self._window_tokens -= self._window.popleft()[1]
+
+    def _pacing_delay(self, tokens: int, now: float) -> float:
+        """Seconds until the per-minute ceilings admit another request of this size (0 if they already do)."""
+        self._prune(now)
+        if not self._window:
+            return 0.0
+        over_requests = self.requests_per_minute and len(self._window) >= self.requests_per_minute
+        over_tokens = self.tokens_per_minute and self._window_tokens + tokens > self.tokens_per_minute
+        if over_requests or over_tokens:
+            return self._window[0][0] + WINDOW_SECONDS - now
+        return 0.0
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """Wait for a slot (and per-minute headroom), then return the request's start time."""
+        async with self._cond:
+            while True:
+                now = time.monotonic()
+                delay = self._pacing_delay(tokens, now)
+                if delay <= 0 and self.in_flight < int(self.limit):
+                    break
+                try:
+                    await asyncio.wait_for(self._cond.wait(), timeout=delay if delay > 0 else None)
+                except TimeoutError:
+                    pass
+            self.in_flight += 1
+            self._window.append((now, tokens))
+            self._window_tokens += tokens
+            self.tokens += tokens
+            return now
+
+    async def release(self, start: float, rate_limited: bool = False, tokens: int = 0) -> None:
+        """Record a finished request (of the size passed to acquire) and adjust the limit."""
+        now = time.monotonic()
+        async with self._cond:
+            self.in_flight -= 1
+            # Requests that started before the last cut were sent under the old limit; they don't cut again
+            fresh = start > self._last_decrease
+            if rate_limited:
+                self.rate_limited += 1
+                if self.adaptive and fresh:
+                    self._cut(self.decrease, now)
+            else:
+                self.completed += 1
+                latency = (now - start) / (LATENCY_BASE_TOKENS + tokens)
+                ewma = self._latency_ewma
+                ewma = self._latency_ewma = latency if ewma is None else ewma + LATENCY_EWMA_ALPHA * (latency - ewma)
+                floor = self._latency_floor
+                if floor is None or ewma < floor:
+                    floor = ewma
+                else:
+                    floor += LATENCY_FLOOR_DECAY / self.limit * (ewma - floor)
+                self._latency_floor = floor
+                congested = self.latency_factor and ewma > self.latency_factor * floor
+                if self.adaptive and congested and fresh:
+                    self._cut(LATENCY_DECREASE, now)
+                elif self.adaptive:
+                    # Like a 429 cut, a latency cut is a response to requests sent before it; keep increasing meanwhile
+                    self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+                    self.peak_limit = max(self.peak_limit, self.limit)
+            self._cond.notify_all()
+        if now - self._last_log >= self.log_interval:
+            self._last_log = now
+            logger.info(self.describe())
+
+    def _cut(self, factor: float, now: float) -> None:
+        self.limit = max(self.min_limit, self.limit * factor)
+        self._last_decrease = now
+
+    def stats(self) -> dict:
+        elapsed = max(time.monotonic() - self._began, 1e-9)
+        return {
+            "limit": round(self.limit, 1),
+            "peak_limit": round(self.peak_limit, 1),
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rate_limited": self.rate_limited,
+            "requests_per_second": round(self.completed / elapsed, 2),
+            "tokens_per_minute": round(self.tokens * 60 / elapsed),
+        }
+
+    def describe(self) -> str:
+        s = self.stats()
+        return (
+            f"concurrency limit {s['limit']} (peak {s['peak_limit']}), {s['in_flight']} in flight, "
+            f"{s['requests_per_second']} req/s, ~{s['tokens_per_minute']} tokens/min, "
+            f"{s['rate_limited']} rate limited"
+        )
@@ -0,0 +1,576 @@
+"""Run every scanner listed in a scout.yaml over each transcript in a single pass.
+
+`scout scan` runs each scanner separately per transcript. This driver deserializes each transcript once and
+runs the deterministic scanners (grading_*, command_not_found, tool_errors...) inline. The LLM scanners
+(scanners.LLM_SCANNERS) are fanned out through one AdaptiveLimiter (tools/adaptive_limiter.py) that starts at
+the config's generate_config.max_connections and tunes concurrency from there on rate limits and latency, so
+the model connection pool stays full while the next transcript is being read. Results go under the same
+scan_id=<id>/ directory `scout scan` uses, but each scanner is split across numbered
+<scanner>.<fragment>.parquet files (see below) with an extra `fragment` column. Only
+analysis/scan_utils.load_scan_results drops rows superseded by a newer fragment; scout view and a plain
+pd.read_parquet of the directory see every fragment, including pairs a resumed run wrote twice.
+
+Progress is checkpointed: completed (transcript, scanner) results are flushed every CHECKPOINT_PAIRS pairs or
+CHECKPOINT_SECONDS to numbered parquet fragments, and only then recorded in the scan's _journal.jsonl. A run
+that dies can be continued with --resume <scan_id>, which skips every journaled pair (so finished judge calls
+are not paid for twice) and appends new fragments to the same scan directory. Pairs whose scanner raised are
+written with scan_error set but never journaled, so a resume retries them. If a crash lands between a
+fragment write and its journal entry, those pairs are re-run and load_scan_results keeps only the rows from
+the newest fragment for each pair.
+
+Run from an eval_grading/<eval> directory, like scout:
+
+    uv run python -m tools.batch_scan scout.yaml
+    uv run python -m tools.batch_scan scout.yaml --resume <scan_id>
+
+With --only-new, the transcripts tree is first diffed against the pairs already in `scans` (see
+scan_utils.missing_scan_pairs) and only the missing pairs are run, opening only the .eval files that hold them,
+so adding a new synth experiment costs a scan of that experiment rather than of everything. --transcripts-file
+restricts the scan to the transcript ids listed in a file, such as a sample drawn by sample_size/sampler.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import ModuleType
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import yaml
+from shortuuid import uuid
+
+from tools.adaptive_limiter import AdaptiveLimiter, is_rate_limit_error, is_transient_error
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 10
+RATE_LIMIT_RETRIES = 6  # a rate-limited judge call is re-queued through the limiter this many times
+TRANSIENT_RETRIES = 3  # ...and one that hit a 5xx, timeout or dropped connection this many times
+CHECKPOINT_PAIRS = 200  # flush completed results after this many (transcript, scanner) pairs...
+CHECKPOINT_SECONDS = 60.0  # ...or this long, whichever comes first
+JOURNAL_NAME = "_journal.jsonl"
+ANALYSIS_DIR = Path(__file__).resolve().parents[1] / "analysis"
+
+
+def load_scanners_module(path: Path) -> ModuleType:
+    """Import a scanners.py file by path (as scout does for `file:` entries)."""
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_scanners(config: dict, config_dir: Path) -> tuple[dict, dict, dict]:
+    """Instantiate the scanners in a scout.yaml, split into (deterministic, llm) dicts keyed by name.
+
+    Also returns each LLM scanner's token_budget param, if set (used to estimate request sizes).
+    """
+    deterministic, llm, budgets = {}, {}, {}
+    modules: dict[Path, ModuleType] = {}
+    for entry in config.get("scanners") or []:
+        path = (config_dir / entry["file"]).resolve()
+        if path not in modules:
+            modules[path] = load_scanners_module(path)
+        module = modules[path]
+        factory = getattr(module, entry["name"])
+        params = entry.get("params") or {}
+        instance = factory(**params)
+        if entry["name"] in getattr(module, "LLM_SCANNERS", ()):
+            llm[entry["name"]] = instance
+            budgets[entry["name"]] = params.get("token_budget")
+        else:
+            deterministic[entry["name"]] = instance
+    return deterministic, llm, budgets
+
+
+def eval_files(transcripts_dir: Path) -> list[Path]:
+    return sorted(p for p in transcripts_dir.rglob("*.eval") if p.is_file())
+
+
+def iter_transcripts(
+    transcripts_dir: Path,
+    files: list[Path] | None = None,
+    transcript_ids: set[str] | None = None,
+):
+    """Yield one scout Transcript per sample in every .eval file under transcripts_dir, reading each sample once.
+
+    Transcript fields follow scout's eval-log transcripts: the sample uuid as transcript_id, and sample metadata
+    nested under metadata["sample_metadata"] (see scanners.get_gold_answers). success follows
+    scan_utils._is_success ("C", or a number > 0), as in load_eval_logs. files and transcript_ids restrict
+    the walk to those .eval files and sample uuids.
+    """
+    from inspect_ai.log import read_eval_log, read_eval_log_samples
+    from inspect_scout import Transcript
+
+    if str(ANALYSIS_DIR) not in sys.path:
+        sys.path.insert(0, str(ANALYSIS_DIR))
+    from scan_utils import _is_success
+
+    for eval_file in files if files is not None else eval_files(transcripts_dir):
+        header = read_eval_log(str(eval_file), header_only=True)
+        for sample in read_eval_log_samples(str(eval_file), all_samples_required=False):
+            if transcript_ids is not None and sample.uuid not in transcript_ids:
+                continue
+            score = next(iter((sample.scores or {}).values()), None)
+            score_value = getattr(score, "value", None)
+            yield Transcript(
+                transcript_id=sample.uuid,
+                source_type="eval_log",
+                source_id=header.eval.eval_id,
+                source_uri=str(eval_file),
+                metadata={
+                    "id": sample.id,
+                    "epoch": sample.epoch,
+                    "task": header.eval.task,
+                    "model": header.eval.model,
+                    "sample_metadata": sample.metadata or {},
+                },
+                messages=sample.messages,
+                events=[],
+                score=score_value,
+                # Same rule as load_eval_logs' transcript_success; dict/list scores have no single pass/fail
+                success=_is_success(score_value) if not isinstance(score_value, (dict, list)) else None,
+            )
+
+
+def result_rows(scan_id: str, scanner_name: str, transcript, output, error: str | None = None) -> list[dict]:
+    """Flatten a scanner's output (a Result, a list of Results, or nothing) into parquet rows.
+
+    A scanner that returns no results still gets one row with value None, so a clean transcript is
+    distinguishable from one that was never scanned.
+    """
+    results = output if isinstance(output, list) else [output] if output is not None else []
+    base = {
+        "scan_id": scan_id,
+        "scanner_key": scanner_name,
+        "scanner_name": scanner_name,
+        "transcript_id": transcript.transcript_id,
+        "transcript_source_uri": getattr(transcript, "source_uri", None),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "scan_error": error,
+    }
+    if not results:
+        return [{**base, "uuid": uuid(), "value": None, "answer": None, "explanation": None,
+                 "metadata": None, "references": None}]
+    return [
+        {
+            **base,
+            "uuid": uuid(),
+            "value": r.value,
+            "answer": r.answer,
+            "explanation": r.explanation,
+            "metadata": json.dumps(r.metadata, default=str) if r.metadata else None,
+            "references": json.dumps([ref.model_dump() if hasattr(ref, "model_dump") else vars(ref)
+                                      for ref in r.references or []]),
+        }
+        for r in results
+    ]
+
+
+def _value_array(values: list) -> pa.Array:
+    """One typed column per scanner file: bool, float64, or string (dict/list values as JSON)."""
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, bool) for v in present):
+        return pa.array(values, type=pa.bool_())
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return pa.array(values, type=pa.float64())
+    return pa.array(
+        [None if v is None else v if isinstance(v, str) else json.dumps(v, default=str) for v in values],
+        type=pa.string(),
+    )
+
+
+class ScanJournal:
+    """Checkpointed output for one scan directory.
+
+    Results are buffered per scanner and flushed as <scanner>.<fragment>.parquet files; the (transcript, scanner)
+    pairs in a fragment are appended to _journal.jsonl (and fsynced) only after the fragment is in place, so a
+    journaled pair always has its rows on disk. Pairs whose scanner raised are written (with scan_error set) but not
+    journaled, so a resume runs them again and its newer fragment supersedes the error rows. Re-opening an existing
+    scan directory reads the journal back.
+    """
+
+    def __init__(self, scan_dir: Path) -> None:
+        self.scan_dir = scan_dir
+        self.path = scan_dir / JOURNAL_NAME
+        self.done: set[tuple[str, str]] = set()
+        self.fragment = 0
+        scan_dir.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            for line in self.path.read_text().splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:  # a line torn by a crash mid-write; its pair simply runs again
+                    continue
+                self.done.add((entry["transcript_id"], entry["scanner"]))
+                self.fragment = max(self.fragment, entry["fragment"])
+        for existing in scan_dir.glob("*.parquet"):
+            suffix = existing.stem.rsplit(".", 1)[-1]
+            if suffix.isdigit():
+                self.fragment = max(self.fragment, int(suffix))
+        self._buffer: dict[str, list[dict]] = {}
+        self._buffered_pairs: list[tuple[str, str]] = []
+        self._failed_pairs: set[tuple[str, str]] = set()
+        self._last_flush = time.monotonic()
+
+    def is_done(self, transcript_id: str, scanner_name: str) -> bool:
+        return (transcript_id, scanner_name) in self.done
+
+    def add(self, scanner_name: str, transcript_id: str, rows: list[dict], failed: bool = False) -> None:
+        self._buffer.setdefault(scanner_name, []).extend(rows)
+        self._buffered_pairs.append((transcript_id, scanner_name))
+        if failed:
+            self._failed_pairs.add((transcript_id, scanner_name))
+
+    def should_flush(self) -> bool:
+        return bool(self._buffered_pairs) and (
+            len(self._buffered_pairs) >= CHECKPOINT_PAIRS or time.monotonic() - self._last_flush >= CHECKPOINT_SECONDS
+        )
+
+    def flush(self) -> None:
+        """Write buffered rows as a new fragment, then journal their pairs (except failed ones)."""
+        self._last_flush = time.monotonic()
+        if not self._buffered_pairs:
+            return
+        self.fragment += 1
+        for scanner_name, rows in self._buffer.items():
+            for row in rows:
+                row["fragment"] = self.fragment
+            columns = {key: [row[key] for row in rows] for key in rows[0]}
+            arrays = {
+                key: _value_array(col) if key == "value"
+                else pa.array(col, type=pa.int64()) if key == "fragment"
+                else pa.array(col, type=pa.string())
+                for key, col in columns.items()
+            }
+            path = self.scan_dir / f"{scanner_name}.{self.fragment:05d}.parquet"
+            tmp_path = path.with_name(path.name + ".tmp")
+            pq.write_table(pa.table(arrays), tmp_path)
+            os.replace(tmp_path, path)
+        completed = [pair for pair in self._buffered_pairs if pair not in self._failed_pairs]
+        with self.path.open("a") as journal:
+            for transcript_id, scanner_name in completed:
+                journal.write(json.dumps(
+                    {"transcript_id": transcript_id, "scanner": scanner_name, "fragment": self.fragment}
+                ) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        self.done.update(completed)
+        self._buffer.clear()
+        self._buffered_pairs.clear()
+        self._failed_pairs.clear()
+
+
+def read_transcript_filter(path: Path) -> set[str]:
+    """Transcript ids from a filter file: one per line, blank lines and # comments ignored."""
+    lines = (line.strip() for line in path.read_text().splitlines())
+    return {line for line in lines if line and not line.startswith("#")}
+
+
+def missing_pairs(
+    transcripts_dir: Path, scans_dir: Path, scanner_names: list[str], transcript_ids: set[str] | None = None
+) -> tuple[dict[str, set[str]], list[Path]]:
+    """Return the scanners each transcript still needs (keyed by transcript_id) and the .eval files holding them."""
+    if str(ANALYSIS_DIR) not in sys.path:
+        sys.path.insert(0, str(ANALYSIS_DIR))
+    from scan_utils import missing_scan_pairs
+
+    missing = missing_scan_pairs(transcripts_dir, scans_dir, scanner_names)
+    if transcript_ids is not None:
+        missing = missing[missing["transcript_id"].isin(transcript_ids)]
+    todo: dict[str, set[str]] = {}
+    for transcript_id, scanner_name in zip(missing["transcript_id"], missing["scanner_key"]):
+        todo.setdefault(transcript_id, set()).add(scanner_name)
+    files = sorted({transcripts_dir / eval_file for eval_file in missing["eval_file"].unique()})
+    return todo, files
+
+
+def activate_model(model) -> None:
+    """Make model the active inspect_ai model, which llm_scanner (and scanners._active_model) get from get_model().
+
+    inspect_ai only sets the active model inside eval() and has no public setter, so this is the one place that
+    reaches into its private module; if an inspect_ai upgrade moves it, fail here with the version rather than
+    running every judge against the wrong model.
+    """
+    try:
+        from inspect_ai.model._model import init_active_model
+    except ImportError as ex:
+        from importlib.metadata import version
+
+        raise RuntimeError(
+            f"inspect_ai {version('inspect_ai')} has no inspect_ai.model._model.init_active_model; "
+            "update tools/batch_scan.activate_model for this version"
+        ) from ex
+    init_active_model(model, model.config)
+
+
+def write_scan_info(scan_dir: Path, scan_info: dict) -> None:
+    tmp_path = scan_dir / "_scan.json.tmp"
+    tmp_path.write_text(json.dumps(scan_info, indent=1, default=str))
+    os.replace(tmp_path, scan_dir / "_scan.json")
+
+
+def estimate_tokens(transcript, budget: int | None) -> int:
+    """Rough prompt size for tokens-per-minute pacing: the transcript text, capped at the scanner's token budget."""
+    tokens = sum(len(m.text) for m in transcript.messages) // 4
+    return min(tokens, budget) if budget else tokens
+
+
+async def run_batch(
+    config_path: Path,
+    limit: int | None = None,
+    adaptive: bool = True,
+    max_concurrency: int | None = None,
+    requests_per_minute: int | None = None,
+    tokens_per_minute: int | None = None,
+    resume: str | None = None,
+    only_new: bool = False,
+    transcript_ids: set[str] | None = None,
+) -> Path | None:
+    """Scan every transcript in config_path's `transcripts` with all its scanners; return the scan directory.
+
+    LLM calls start at generate_config.max_connections concurrent requests; with adaptive=True the limit then
+    moves between 1 and max_concurrency (default 4x the start) by AIMD. Rate-limited calls are retried through
+    the limiter rather than by the model client, so the limiter sees every 429; since that turns the client's own
+    retries off, 5xx, timeout and connection errors are retried here too (TRANSIENT_RETRIES, with backoff).
+
+    With resume set to the id of an earlier (interrupted) scan, pairs already in its journal are skipped and new
+    results are added to the same scan directory.
+
+    With only_new=True, only (transcript, scanner) pairs that have no results anywhere in `scans` are run, and
+    only the .eval files containing them are read. Returns None when there is nothing new to scan. With
+    transcript_ids, transcripts outside that set are skipped.
+    """
+    config = yaml.safe_load(config_path.read_text())
+    config_dir = config_path.parent
+    transcripts_dir = (config_dir / config["transcripts"]).resolve()
+    scans_dir = (config_dir / config.get("scans", "./scans")).resolve()
+    generate_config = dict(config.get("generate_config") or {})
+    max_connections = generate_config.get("max_connections", DEFAULT_MAX_CONNECTIONS)
+    limiter = AdaptiveLimiter(
+        initial=max_connections,
+        max_limit=(max_concurrency or 4 * max_connections) if adaptive else max_connections,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        adaptive=adaptive,
+    )
+
+    deterministic, llm, budgets = build_scanners(config, config_dir)
+    scanner_names = [*deterministic, *llm]
+    todo: dict[str, set[str]] | None = None
+    files: list[Path] | None = None
+    if only_new:
+        todo, files = missing_pairs(transcripts_dir, scans_dir, scanner_names, transcript_ids)
+        if not todo:
+            logger.info(f"Every transcript under {transcripts_dir} already has results from all scanners")
+            return None
+        logger.info(
+            f"{sum(len(names) for names in todo.values())} missing (transcript, scanner) pairs "
+            f"across {len(todo)} transcripts in {len(files)} .eval files"
+        )
+    if llm:
+        from inspect_ai.model import GenerateConfig, get_model
+
+        # The limiter owns concurrency and retries (429s, and with the client's retries off, transient 5xx/timeout
+        # errors too, see run_llm); keep the client from queueing or retrying behind its back
+        client_config = {**generate_config, "max_connections": limiter.max_limit}
+        if adaptive:
+            client_config.setdefault("max_retries", 0)
+        activate_model(get_model(config["model"], config=GenerateConfig(**client_config)))
+
+    scan_id = resume or uuid()
+    scan_dir = scans_dir / f"scan_id={scan_id}"
+    if resume and not scan_dir.exists():
+        raise FileNotFoundError(f"No scan to resume at {scan_dir}")
+    journal = ScanJournal(scan_dir)
+    scan_info = {
+        "scan_id": scan_id,
+        "scan_name": "batch_scan",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "transcripts": str(transcripts_dir),
+        "scanners": scanner_names,
+        "model": config.get("model") if llm else None,
+        "generate_config": generate_config,
+        "only_new": only_new,
+        "transcript_filter": len(transcript_ids) if transcript_ids is not None else None,
+        "complete": False,
+    }
+    if resume:
+        previous = json.loads((scan_dir / "_scan.json").read_text()) if (scan_dir / "_scan.json").exists() else {}
+        scan_info["timestamp"] = previous.get("timestamp", scan_info["timestamp"])
+        scan_info["resumed"] = [*previous.get("resumed", []), datetime.now(timezone.utc).isoformat()]
+        logger.info(f"Resuming scan {scan_id}: {len(journal.done)} (transcript, scanner) pairs already done")
+    write_scan_info(scan_dir, scan_info)
+
+    pending: set[asyncio.Task] = set()
+    started = time.perf_counter()
+
+    async def run_llm(name: str, scanner, transcript, tokens: int) -> None:
+        output, error = None, None
+        rate_limit_attempts = transient_attempts = 0
+        while True:
+            start = await limiter.acquire(tokens)
+            try:
+                output, error = await scanner(transcript), None
+            except Exception as ex:  # one failed judge call shouldn't sink the batch
+                rate_limited = is_rate_limit_error(ex)
+                await limiter.release(start, rate_limited=rate_limited, tokens=tokens)
+                output, error = None, repr(ex)
+                if rate_limited and rate_limit_attempts < RATE_LIMIT_RETRIES:
+                    await asyncio.sleep(min(2**rate_limit_attempts, 30))
+                    rate_limit_attempts += 1
+                    continue
+                if not rate_limited and is_transient_error(ex) and transient_attempts < TRANSIENT_RETRIES:
+                    await asyncio.sleep(min(2**transient_attempts, 30))
+                    transient_attempts += 1
+                    continue
+                logger.warning(f"{name} failed on {transcript.transcript_id}: {ex}")
+                break
+            await limiter.release(start, tokens=tokens)
+            break
+        rows = result_rows(scan_id, name, transcript, output, error)
+        journal.add(name, transcript.transcript_id, rows, failed=error is not None)
+
+    def already_scanned(transcript_id: str, name: str) -> bool:
+        return journal.is_done(transcript_id, name) or (todo is not None and name not in todo[transcript_id])
+
+    transcripts = iter_transcripts(transcripts_dir, files, set(todo) if todo is not None else transcript_ids)
+    n_transcripts = 0
+    try:
+        while limit is None or n_transcripts < limit:
+            # Deserialize off the event loop so in-flight judge calls keep progressing
+            transcript = await asyncio.to_thread(next, transcripts, None)
+            if transcript is None:
+                break
+            n_transcripts += 1
+            transcript_id = transcript.transcript_id
+
+            for name, scanner in deterministic.items():
+                if already_scanned(transcript_id, name):
+                    continue
+                try:
+                    output, error = await scanner(transcript), None
+                except Exception as ex:
+                    logger.warning(f"{name} failed on {transcript_id}: {ex}")
+                    output, error = None, repr(ex)
+                rows = result_rows(scan_id, name, transcript, output, error)
+                journal.add(name, transcript_id, rows, failed=error is not None)
+
+            for name, scanner in llm.items():
+                if already_scanned(transcript_id, name):
+                    continue
+                # backpressure: stop reading transcripts while more calls are queued than the limiter could ever run
+                while len(pending) >= 2 * limiter.max_limit:
+                    await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                tokens = estimate_tokens(transcript, budgets[name])
+                task = asyncio.create_task(run_llm(name, scanner, transcript, tokens))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if journal.should_flush():
+                journal.flush()
+            if n_transcripts % 100 == 0:
+                logger.info(f"{n_transcripts} transcripts read, {len(pending)} judge calls queued or in flight")
+
+        if pending:
+            await asyncio.gather(*pending)
+    finally:
+        # Keep whatever finished, even if the run is interrupted; unfinished pairs run again on --resume
+        journal.flush()
+
+    if llm:
+        logger.info(f"LLM calls: {limiter.describe()}")
+    write_scan_info(scan_dir, {
+        **scan_info,
+        "transcript_count": n_transcripts,
+        "llm_calls": limiter.stats() if llm else None,
+        "complete": True,
+    })
+    logger.info(
+        f"Scanned {n_transcripts} transcripts with {len(scanner_names)} scanners "
+        f"in {time.perf_counter() - started:.1f}s → {scan_dir}"
+    )
+    return scan_dir
+
+
+def main() -> None:
+    """Entry point."""
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    parser = argparse.ArgumentParser(
+        description="Run all scanners in a scout.yaml over each transcript in one pass."
+    )
+    parser.add_argument(
+        "config",
+        type=Path,
+        nargs="?",
+        default=Path("scout.yaml"),
+        help="scout.yaml to read transcripts, scans, scanners, model and generate_config from",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        help="Only scan the first N transcripts",
+    )
+    parser.add_argument(
+        "--fixed-concurrency",
+        action="store_true",
+        help="Keep LLM concurrency at generate_config.max_connections instead of adapting it",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        help="Upper bound for adaptive concurrency (default: 4x generate_config.max_connections)",
+    )
+    parser.add_argument(
+        "--rpm",
+        type=int,
+        help="Provider requests-per-minute limit to stay under",
+    )
+    parser.add_argument(
+        "--tpm",
+        type=int,
+        help="Provider tokens-per-minute limit to stay under (prompt sizes are estimated)",
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        metavar="SCAN_ID",
+        help="Continue an interrupted scan, skipping (transcript, scanner) pairs in its journal",
+    )
+    parser.add_argument(
+        "--only-new",
+        action="store_true",
+        help="Only run (transcript, scanner) pairs that have no results in any existing scan",
+    )
+    parser.add_argument(
+        "--transcripts-file",
+        type=Path,
+        help="Only scan the transcript ids listed in this file (one per line, e.g. from sample_size/sampler.py)",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(run_batch(
+        args.config,
+        limit=args.limit,
+        adaptive=not args.fixed_concurrency,
+        max_concurrency=args.max_concurrency,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        resume=args.resume,
+        only_new=args.only_new,
+        transcript_ids=read_transcript_filter(args.transcripts_file) if args.transcripts_file else None,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Local OpenAI-compatible chat completions server that injects rate-limit responses.
+
+For exercising tools/adaptive_limiter.py (and tools/batch_scan.py) without spending tokens. Requests beyond
+--capacity concurrent, or over --rpm / --tpm in the last minute, get a 429 like the OpenAI API returns; the
+rest get a canned numeric answer after --latency seconds, slowed further as concurrency approaches capacity.
+
+    uv run python -m tools.mock_model_server --capacity 16 --rpm 600
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=mock \\
+        uv run python -m tools.batch_scan scout.yaml
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+CANNED_ANSWER = "The transcript shows no issue for this criterion [M1].\n\nANSWER: 0"
+
+
+class MockModelState:
+    """Admission control shared by the request handler threads."""
+
+    def __init__(self, capacity: int, rpm: int | None, tpm: int | None, latency: float) -> None:
+        self.capacity = capacity
+        self.rpm = rpm
+        self.tpm = tpm
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.window: deque[tuple[float, int]] = deque()
+        self.served = 0
+        self.rejected = 0
+
+    def admit(self, tokens: int) -> tuple[bool, str]:
+        now = time.monotonic()
+        with self.lock:
+            while self.window and self.window[0][0] <= now - 60:
+                self.window.popleft()
+            if self.in_flight >= self.capacity:
+                reason = "concurrency"
+            elif self.rpm and len(self.window) >= self.rpm:
+                reason = "requests per minute"
+            elif self.tpm and sum(t for _, t in self.window) + tokens > self.tpm:
+                reason = "tokens per minute"
+            else:
+                self.in_flight += 1
+                self.window.append((now, tokens))
+                return True, ""
+            self.rejected += 1
+            return False, reason
+
+    def finish(self) -> None:
+        with self.lock:
+            self.in_flight -= 1
+            self.served += 1
+
+
+def make_handler(state: MockModelState) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args) -> None:  # keep the console for the summary lines
+            pass
+
+        def _send(self, status: int, body: dict, headers: dict | None = None) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self) -> None:
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+                return
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            prompt_chars = sum(len(str(m.get("content", ""))) for m in request.get("messages", []))
+            prompt_tokens = prompt_chars // 4 + 1
+
+            admitted, reason = state.admit(prompt_tokens)
+            if not admitted:
+                self._send(
+                    429,
+                    {"error": {"message": f"Rate limit reached ({reason})", "type": "rate_limit_error",
+                               "code": "rate_limit_exceeded"}},
+                    headers={"retry-after": "1"},
+                )
+                return
+            try:
+                # Service time grows as the server fills up, like a provider queueing under load
+                time.sleep(state.latency * (1 + state.in_flight / state.capacity))
+            finally:
+                state.finish()
+            completion_tokens = len(CANNED_ANSWER) // 4
+            self._send(200, {
+                "id": f"chatcmpl-mock-{state.served}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "mock"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": CANNED_ANSWER},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            })
+
+    return Handler
+
+
+def serve(host: str, port: int, state: MockModelState) -> ThreadingHTTPServer:
+    """Start the server on a background thread and return it (call .shutdown() to stop)."""
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    """Entry point."""
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    parser = argparse.ArgumentParser(description="Mock OpenAI chat completions server with injected 429s.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--capacity", type=int, default=16, help="Concurrent requests served before 429s")
+    parser.add_argument("--rpm", type=int, help="Requests per minute before 429s")
+    parser.add_argument("--tpm", type=int, help="Prompt tokens per minute before 429s")
+    parser.add_argument("--latency", type=float, default=0.5, help="Base seconds per completion")
+    args = parser.parse_args()
+
+    state = MockModelState(args.capacity, args.rpm, args.tpm, args.latency)
+    server = serve(args.host, args.port, state)
+    logger.info(f"Mock model server on http://{args.host}:{args.port}/v1 (capacity {args.capacity})")
+    try:
+        while True:
+            time.sleep(10)
+            logger.info(f"served {state.served}, rejected {state.rejected}, in flight {state.in_flight}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
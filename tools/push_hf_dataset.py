@@ -15,6 +15,9 @@ logger = logging.getLogger(__name__)
 
 DATASET_REPO_ID = "arcadia-mars-4-0/abc-scout-scanners"
 
+# Local-only sidecar caches written by analysis/scan_utils.py; never uploaded
+LOCAL_CACHE_PATTERNS = (".summaries_cache.sqlite*", ".scan_index")
+
 
 def push_dataset(
     eval_logs_dir: Path,
@@ -41,7 +44,12 @@ def push_dataset(
         staging_scan_results.mkdir(parents=True)
 
         if eval_logs_dir.exists():
-            shutil.copytree(eval_logs_dir, staging_eval_logs, dirs_exist_ok=True)
+            shutil.copytree(
+                eval_logs_dir,
+                staging_eval_logs,
+                dirs_exist_ok=True,
+                ignore=shutil.ignore_patterns(*LOCAL_CACHE_PATTERNS),
+            )
             logger.info(f"Staged eval-logs from {eval_logs_dir}")
         else:
             logger.warning(f"eval-logs directory not found: {eval_logs_dir}")
@@ -53,7 +61,12 @@ def push_dataset(
             logger.warning(f"validation directory not found: {validation_dir}")
 
         if scan_results_dir.exists():
-            shutil.copytree(scan_results_dir, staging_scan_results, dirs_exist_ok=True)
+            shutil.copytree(
+                scan_results_dir,
+                staging_scan_results,
+                dirs_exist_ok=True,
+                ignore=shutil.ignore_patterns(*LOCAL_CACHE_PATTERNS),
+            )
             if scanner_name is None:
                 logger.info(f"Staged full scan-results tree from {scan_results_dir}")
             else: